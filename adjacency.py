@@ -0,0 +1,407 @@
+from array import array
+from collections import Counter
+from pprint import pformat
+
+MATRIX_STORAGE = 'matrix'
+CSR_STORAGE = 'csr'
+
+# Grafy o co najwyżej tylu wierzchołkach zawsze trzymane są w macierzy sąsiedztwa
+SMALL_GRAPH_VERTICES = 64
+# Powyżej tej liczby wierzchołków macierz V×V jest zbyt kosztowna pamięciowo
+DENSE_GRAPH_MAX_VERTICES = 1024
+# Minimalny stosunek liczby krawędzi do V² dla wyboru macierzy
+DENSE_GRAPH_MIN_DENSITY = 0.1
+
+
+def choose_storage(vertex_count: int, edge_count: int) -> str:
+    if vertex_count <= SMALL_GRAPH_VERTICES:
+        return MATRIX_STORAGE
+    if vertex_count <= DENSE_GRAPH_MAX_VERTICES \
+            and edge_count >= DENSE_GRAPH_MIN_DENSITY * vertex_count * vertex_count:
+        return MATRIX_STORAGE
+    return CSR_STORAGE
+
+
+def build_csr(vertex_count: int, edges, directed: bool, weights=None):
+    # Sortowanie przez zliczanie: offsets[v]..offsets[v + 1] to zakres sąsiadów v w targets
+    edges = list(edges)
+    offsets = array('q', bytes(8 * (vertex_count + 1)))
+    for u, v in edges:
+        offsets[u + 1] += 1
+        if not directed:
+            offsets[v + 1] += 1
+    for v in range(vertex_count):
+        offsets[v + 1] += offsets[v]
+
+    targets = array('q', bytes(8 * offsets[vertex_count]))
+    target_weights = [0] * offsets[vertex_count] if weights is not None else None
+    position = array('q', offsets[:vertex_count])
+    for i, (u, v) in enumerate(edges):
+        targets[position[u]] = v
+        if target_weights is not None:
+            target_weights[position[u]] = weights[i]
+        position[u] += 1
+        if not directed:
+            targets[position[v]] = u
+            if target_weights is not None:
+                target_weights[position[v]] = weights[i]
+            position[v] += 1
+
+    if weights is None:
+        return offsets, targets
+    return offsets, targets, target_weights
+
+
+class DegreeHistogram:
+    # Liczba wierzchołków każdego stopnia utrzymywana przy zmianach stopni o 1, wraz z najmniejszym
+    # i największym stopniem oraz liczbą wierzchołków stopnia nieparzystego
+    def __init__(self, degrees=()):
+        self.counts = array('q', [0])
+        self.vertex_count = 0
+        self.odd_count = 0
+        self.min_degree = -1
+        self.max_degree = -1
+        for degree in degrees:
+            self.add(degree)
+
+    def add(self, degree: int, count: int = 1):
+        if degree >= len(self.counts):
+            self.counts.extend(bytes(8 * (degree + 1 - len(self.counts))))
+        self.counts[degree] += count
+        self.odd_count += count * (degree % 2)
+        if not self.vertex_count or degree < self.min_degree:
+            self.min_degree = degree
+        if not self.vertex_count or degree > self.max_degree:
+            self.max_degree = degree
+        self.vertex_count += count
+
+    def remove(self, degree: int, count: int = 1):
+        self.counts[degree] -= count
+        self.odd_count -= count * (degree % 2)
+        self.vertex_count -= count
+        if not self.vertex_count:
+            self.min_degree = self.max_degree = -1
+            return
+        if self.counts[degree]:
+            return
+        while not self.counts[self.min_degree]:
+            self.min_degree += 1
+        while not self.counts[self.max_degree]:
+            self.max_degree -= 1
+
+    def increment(self, degree: int):
+        if degree + 1 == len(self.counts):
+            self.counts.append(0)
+        self.counts[degree] -= 1
+        self.counts[degree + 1] += 1
+        self.odd_count += 1 if degree % 2 == 0 else -1
+        if degree + 1 > self.max_degree:
+            self.max_degree = degree + 1
+        if degree == self.min_degree and not self.counts[degree]:
+            self.min_degree = degree + 1
+
+    def decrement(self, degree: int):
+        self.counts[degree] -= 1
+        self.counts[degree - 1] += 1
+        self.odd_count += 1 if degree % 2 == 0 else -1
+        if degree - 1 < self.min_degree:
+            self.min_degree = degree - 1
+        if degree == self.max_degree and not self.counts[degree]:
+            self.max_degree = degree - 1
+
+    def minimum(self, skipped_zeros: int = 0) -> int:
+        # skipped_zeros - liczba pozycji stopnia 0, które nie są wierzchołkami grafu (np. usunięte)
+        if self.counts[0] > skipped_zeros or self.min_degree > 0:
+            return self.min_degree
+        degree = 1
+        while degree <= self.max_degree and not self.counts[degree]:
+            degree += 1
+        return degree if degree <= self.max_degree else 0
+
+    def histogram(self, skipped_zeros: int = 0) -> list:
+        histogram = list(self.counts[:self.max_degree + 1])
+        if histogram:
+            histogram[0] -= skipped_zeros
+        return histogram
+
+    def sorted_degrees(self, skipped_zeros: int = 0) -> list:
+        # Ciąg stopni posortowany nierosnąco przez zliczanie, O(V + maksymalny stopień)
+        histogram = self.histogram(skipped_zeros)
+        return [degree for degree in range(len(histogram) - 1, -1, -1) for _ in range(histogram[degree])]
+
+
+class MatrixAdjacency:
+    def __init__(self, vertex_count: int, edges, directed: bool):
+        self.directed = directed
+        self.matrix = [[0 for _ in range(vertex_count)] for _ in range(vertex_count)]
+        self.out_degrees = array('q', bytes(8 * vertex_count))
+        # Dla grafu nieskierowanego stopień wejściowy i wyjściowy to ta sama tablica
+        self.in_degrees = array('q', bytes(8 * vertex_count)) if directed else self.out_degrees
+        self.out_histogram = DegreeHistogram(self.out_degrees)
+        self.in_histogram = DegreeHistogram(self.in_degrees) if directed else self.out_histogram
+        for edge in edges:
+            self.add_edge(edge[0], edge[1])
+
+    def __str__(self):
+        return pformat(self.matrix)
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.matrix)
+
+    def add_vertex(self) -> int:
+        return self.add_vertices(1)[0]
+
+    def add_vertices(self, count: int) -> list:
+        first_vertex = len(self.matrix)
+        for row in self.matrix:
+            row.extend(0 for _ in range(count))
+        self.matrix.extend([0 for _ in range(first_vertex + count)] for _ in range(count))
+        self.out_degrees.extend(bytes(8 * count))
+        self.out_histogram.add(0, count)
+        if self.directed:
+            self.in_degrees.extend(bytes(8 * count))
+            self.in_histogram.add(0, count)
+        return list(range(first_vertex, first_vertex + count))
+
+    def remove_last_vertices(self, count: int):
+        # Usuwane wierzchołki nie mogą mieć już żadnych krawędzi
+        del self.matrix[len(self.matrix) - count:]
+        for row in self.matrix:
+            del row[len(self.matrix):]
+        del self.out_degrees[len(self.matrix):]
+        self.out_histogram.remove(0, count)
+        if self.directed:
+            del self.in_degrees[len(self.matrix):]
+            self.in_histogram.remove(0, count)
+
+    def add_edge(self, u: int, v: int):
+        self.matrix[u][v] += 1
+        if not self.directed:
+            self.matrix[v][u] += 1
+        self.out_histogram.increment(self.out_degrees[u])
+        self.out_degrees[u] += 1
+        self.in_histogram.increment(self.in_degrees[v])
+        self.in_degrees[v] += 1
+
+    def remove_edge(self, u: int, v: int):
+        self.matrix[u][v] -= 1
+        if not self.directed:
+            self.matrix[v][u] -= 1
+        self.out_histogram.decrement(self.out_degrees[u])
+        self.out_degrees[u] -= 1
+        self.in_histogram.decrement(self.in_degrees[v])
+        self.in_degrees[v] -= 1
+
+    def multiplicity(self, u: int, v: int) -> int:
+        return self.matrix[u][v]
+
+    def neighbours(self, vertex: int) -> set:
+        return {v for v, edge_count in enumerate(self.matrix[vertex]) if edge_count > 0}
+
+    def predecessors(self, vertex: int) -> set:
+        return {u for u, row in enumerate(self.matrix) if row[vertex] > 0}
+
+    def degree(self, vertex: int) -> int:
+        return self.out_degrees[vertex]
+
+    def in_degree(self, vertex: int) -> int:
+        return self.in_degrees[vertex]
+
+    def to_matrix(self) -> list:
+        return self.matrix
+
+    def to_csr(self):
+        offsets = array('q', [0])
+        targets = array('q')
+        for row in self.matrix:
+            for v, edge_count in enumerate(row):
+                targets.extend(v for _ in range(edge_count))
+            offsets.append(len(targets))
+        return offsets, targets
+
+
+class CsrArcs:
+    # Łuki w formacie CSR wraz ze zmianami od ostatniej kompakcji:
+    # dodani sąsiedzi i liczniki usuniętych pozycji z targets
+    def __init__(self, offsets: array, targets: array):
+        self.offsets = offsets
+        self.targets = targets
+        self._inserted = {}
+        self._deleted = {}
+        self._pending = 0
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def add_vertices(self, count: int):
+        self.offsets.extend([self.offsets[-1]] * count)
+
+    def remove_last_vertices(self, count: int):
+        # Pozycje usuwanych wierzchołków w targets (końcowy fragment tablicy)
+        # są w całości oznaczone jako usunięte
+        for vertex in range(self.vertex_count - count, self.vertex_count):
+            deleted = self._deleted.pop(vertex, None)
+            if deleted:
+                self._pending -= sum(deleted.values())
+            self._inserted.pop(vertex, None)
+        del self.offsets[len(self.offsets) - count:]
+        del self.targets[self.offsets[-1]:]
+
+    def add_arc(self, u: int, v: int):
+        deleted = self._deleted.get(u)
+        if deleted and deleted[v] > 0:
+            deleted[v] -= 1
+        else:
+            self._inserted.setdefault(u, []).append(v)
+        self._pending += 1
+
+    def remove_arc(self, u: int, v: int):
+        inserted = self._inserted.get(u)
+        if inserted and v in inserted:
+            inserted.remove(v)
+        else:
+            self._deleted.setdefault(u, Counter())[v] += 1
+        self._pending += 1
+
+    def iter_targets(self, vertex: int):
+        # Sąsiedzi z krotnościami (każda krawędź równoległa osobno)
+        deleted = self._deleted.get(vertex)
+        if deleted:
+            deleted = Counter(deleted)
+        for i in range(self.offsets[vertex], self.offsets[vertex + 1]):
+            v = self.targets[i]
+            if deleted and deleted[v] > 0:
+                deleted[v] -= 1
+                continue
+            yield v
+        yield from self._inserted.get(vertex, ())
+
+    def compact_if_needed(self):
+        if self._pending > max(len(self.targets), 64):
+            self.compact()
+
+    def compact(self):
+        if not self._pending:
+            return
+        offsets = array('q', [0])
+        targets = array('q')
+        for vertex in range(self.vertex_count):
+            targets.extend(self.iter_targets(vertex))
+            offsets.append(len(targets))
+        self.offsets, self.targets = offsets, targets
+        self._inserted = {}
+        self._deleted = {}
+        self._pending = 0
+
+
+class CsrAdjacency:
+    def __init__(self, vertex_count: int, edges, directed: bool):
+        self.directed = directed
+        edges = list(edges)
+        self.out_arcs = CsrArcs(*build_csr(vertex_count, edges, directed))
+        self.out_degrees = array('q', (self.out_arcs.offsets[v + 1] - self.out_arcs.offsets[v]
+                                       for v in range(vertex_count)))
+        if directed:
+            # Indeks odwrotny: poprzednicy każdego wierzchołka
+            self.in_arcs = CsrArcs(*build_csr(vertex_count, [(v, u) for u, v in edges], directed))
+            self.in_degrees = array('q', (self.in_arcs.offsets[v + 1] - self.in_arcs.offsets[v]
+                                          for v in range(vertex_count)))
+        else:
+            self.in_arcs = self.out_arcs
+            self.in_degrees = self.out_degrees
+        self.out_histogram = DegreeHistogram(self.out_degrees)
+        self.in_histogram = DegreeHistogram(self.in_degrees) if directed else self.out_histogram
+
+    def __str__(self):
+        return pformat({v: sorted(self.neighbours(v)) for v in range(self.vertex_count)})
+
+    @property
+    def vertex_count(self) -> int:
+        return self.out_arcs.vertex_count
+
+    def add_vertex(self) -> int:
+        return self.add_vertices(1)[0]
+
+    def add_vertices(self, count: int) -> list:
+        first_vertex = self.vertex_count
+        self.out_arcs.add_vertices(count)
+        self.out_degrees.extend(bytes(8 * count))
+        self.out_histogram.add(0, count)
+        if self.directed:
+            self.in_arcs.add_vertices(count)
+            self.in_degrees.extend(bytes(8 * count))
+            self.in_histogram.add(0, count)
+        return list(range(first_vertex, first_vertex + count))
+
+    def remove_last_vertices(self, count: int):
+        # Usuwane wierzchołki nie mogą mieć już żadnych krawędzi
+        self.out_arcs.remove_last_vertices(count)
+        del self.out_degrees[self.vertex_count:]
+        self.out_histogram.remove(0, count)
+        if self.directed:
+            self.in_arcs.remove_last_vertices(count)
+            del self.in_degrees[self.vertex_count:]
+            self.in_histogram.remove(0, count)
+
+    def add_edge(self, u: int, v: int):
+        self.out_arcs.add_arc(u, v)
+        self.in_arcs.add_arc(v, u)
+        self.out_histogram.increment(self.out_degrees[u])
+        self.out_degrees[u] += 1
+        self.in_histogram.increment(self.in_degrees[v])
+        self.in_degrees[v] += 1
+        self.out_arcs.compact_if_needed()
+        self.in_arcs.compact_if_needed()
+
+    def remove_edge(self, u: int, v: int):
+        self.out_arcs.remove_arc(u, v)
+        self.in_arcs.remove_arc(v, u)
+        self.out_histogram.decrement(self.out_degrees[u])
+        self.out_degrees[u] -= 1
+        self.in_histogram.decrement(self.in_degrees[v])
+        self.in_degrees[v] -= 1
+        self.out_arcs.compact_if_needed()
+        self.in_arcs.compact_if_needed()
+
+    def iter_targets(self, vertex: int):
+        return self.out_arcs.iter_targets(vertex)
+
+    def multiplicity(self, u: int, v: int) -> int:
+        return sum(1 for w in self.out_arcs.iter_targets(u) if w == v)
+
+    def neighbours(self, vertex: int) -> set:
+        return set(self.out_arcs.iter_targets(vertex))
+
+    def predecessors(self, vertex: int) -> set:
+        return set(self.in_arcs.iter_targets(vertex))
+
+    def degree(self, vertex: int) -> int:
+        return self.out_degrees[vertex]
+
+    def in_degree(self, vertex: int) -> int:
+        return self.in_degrees[vertex]
+
+    def compact(self):
+        self.out_arcs.compact()
+        self.in_arcs.compact()
+
+    def to_matrix(self) -> list:
+        matrix = [[0 for _ in range(self.vertex_count)] for _ in range(self.vertex_count)]
+        for u in range(self.vertex_count):
+            for v in self.out_arcs.iter_targets(u):
+                matrix[u][v] += 1
+        return matrix
+
+    def to_csr(self):
+        self.out_arcs.compact()
+        return self.out_arcs.offsets, self.out_arcs.targets
+
+
+def create_adjacency(storage: str, vertex_count: int, edges, directed: bool):
+    if storage == MATRIX_STORAGE:
+        return MatrixAdjacency(vertex_count, edges, directed)
+    if storage == CSR_STORAGE:
+        return CsrAdjacency(vertex_count, edges, directed)
+    raise ValueError('Nieznany sposób przechowywania grafu: {}.'.format(storage))
@@ -0,0 +1,107 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+from graph import Graph
+from shortest_paths import csr_bellman_ford, csr_dijkstra, weighted_csr
+
+# Tablice CSR procesu roboczego, podpięte do pamięci współdzielonej w _attach_shared_csr
+_shared_csr = None
+
+
+class SharedCsr:
+    # Tablice CSR grafu (offsets, targets, wagi) w blokach multiprocessing.shared_memory.
+    # Procesy robocze podpinają je po nazwach, więc graf nie jest serializowany dla każdego zadania.
+    def __init__(self, graph: Graph):
+        offsets, targets, target_weights = weighted_csr(graph)
+        weights_typecode = 'q' if all(isinstance(weight, int) for weight in target_weights) else 'd'
+        self.layout = []
+        self.blocks = []
+        for typecode, values in (('q', offsets), ('q', targets), (weights_typecode, target_weights)):
+            values = array(typecode, values)
+            block = shared_memory.SharedMemory(create=True, size=max(len(values) * values.itemsize, values.itemsize))
+            block.buf[:len(values) * values.itemsize] = values.tobytes()
+            self.blocks.append(block)
+            self.layout.append((block.name, typecode, len(values)))
+        self.graph_vertex_count = len(graph.vertices)
+        self.non_negative = all(weight >= 0 for weight in target_weights)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def _attach_shared_csr(layout: list, graph_vertex_count: int, non_negative: bool):
+    global _shared_csr
+    blocks = []
+    views = []
+    for name, typecode, length in layout:
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        views.append(block.buf[:length * array(typecode).itemsize].cast(typecode))
+    _shared_csr = blocks, views, graph_vertex_count, non_negative
+
+
+def _shortest_paths_from_sources(sources: list) -> list:
+    _, (offsets, targets, target_weights), graph_vertex_count, non_negative = _shared_csr
+    results = []
+    for source in sources:
+        if non_negative:
+            distances, _ = csr_dijkstra(offsets, targets, target_weights, source)
+        else:
+            distances, _ = csr_bellman_ford(offsets, targets, target_weights, source, graph_vertex_count)
+        results.append((source, distances))
+    return results
+
+
+def batch_shortest_paths(graph: Graph, sources, max_workers: int = None, chunk_size: int = None):
+    # Odległości od wielu źródeł liczone w puli procesów. Generator zwraca pary (źródło, odległości)
+    # w kolejności kończenia się zadań; odległości to lista indeksowana numerem wierzchołka (inf dla
+    # nieosiągalnych). Dla wag nieujemnych używany jest algorytm Dijkstry, w przeciwnym razie SPFA.
+    sources = list(sources)
+    for source in sources:
+        if source not in graph.vertices:
+            raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(source))
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, len(sources) // (4 * max_workers))
+
+    with SharedCsr(graph) as shared_csr:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_shared_csr,
+                                 initargs=(shared_csr.layout, shared_csr.graph_vertex_count,
+                                           shared_csr.non_negative)) as executor:
+            futures = [executor.submit(_shortest_paths_from_sources, sources[i:i + chunk_size])
+                       for i in range(0, len(sources), chunk_size)]
+            for future in as_completed(futures):
+                yield from future.result()
+
+
+def batch_shortest_path_maps(graph: Graph, sources, max_workers: int = None) -> dict:
+    # Wyniki w postaci jak DirectedNetwork.get_shortest_path_map: źródło -> {wierzchołek: odległość}
+    return {source: {vertex: distances[vertex] for vertex in graph.vertices}
+            for source, distances in batch_shortest_paths(graph, sources, max_workers=max_workers)}
+
+
+if __name__ == '__main__':
+    from directed_network import DirectedNetwork
+
+    test_network = DirectedNetwork(edges=[(0, 1), (0, 3),
+                                          (3, 1), (3, 4),
+                                          (1, 2), (2, 4),
+                                          (2, 5), (4, 5)
+                                          ],
+                                   weights=[1, 2, 4, 3, 6, 1, 4, 1],
+                                   vertices=set([i for i in range(0, 6)]),
+                                   start_vertex=0,
+                                   end_vertex=5
+                                   )
+    for test_source, test_distances in sorted(batch_shortest_path_maps(test_network, range(6)).items()):
+        print('Odległości od wierzchołka {}: {}'.format(test_source, test_distances))
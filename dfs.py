@@ -1,35 +1,21 @@
+from disjoint_set import UnionFind
+from frontier_bfs import frontier_connected_components, frontier_reached_count, use_frontier_engine
 from graph import Graph
+from traversal import dfs_pre_order, dfs_tree_edges
 from tree import Tree
 
-
-def dfs_visit_vertex(graph: Graph, vertex, visited_vertex_map: dict,
-                     visited_edges: list or None,
-                     visited_vertices: list or set or None):
-    visited_vertex_map[vertex] = True
-    if visited_vertices is not None:
-        if isinstance(visited_vertices, list):
-            visited_vertices.append(vertex)
-        else:
-            visited_vertices.add(vertex)
-    for neighbour_vertex in graph.get_vertex_neighbours(vertex):
-        visited = visited_vertex_map[neighbour_vertex]
-        if not visited:
-            if visited_edges is not None:
-                visited_edges.append((vertex, neighbour_vertex))
-            dfs_visit_vertex(graph, neighbour_vertex, visited_vertex_map,
-                             visited_edges, visited_vertices)
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 def dfs_spanning_tree(graph: Graph, root_vertex) -> Tree:
     if root_vertex not in graph.vertices:
         raise ValueError('Wierzchołek startowy nie należy do grafu.')
 
-    spanning_tree_edges = []
+    spanning_tree_edges = list(dfs_tree_edges(graph, [root_vertex]))
     spanning_tree = None
-    visited_vertex_map = {v: False for v in graph.vertices}
-    dfs_visit_vertex(graph, root_vertex, visited_vertex_map,
-                     visited_edges=spanning_tree_edges,
-                     visited_vertices=None)
 
     spanning_tree_vertices = set()
     for spanning_edge in spanning_tree_edges:
@@ -44,26 +30,42 @@ def dfs_spanning_tree(graph: Graph, root_vertex) -> Tree:
 
 
 def dfs_connected_components(graph: Graph) -> set:
+    if use_frontier_engine(graph):
+        labels, sizes = frontier_connected_components(graph)
+        # Wierzchołki pogrupowane według etykiet: po sortowaniu każda składowa to spójny fragment
+        vertices_by_label = numpy.argsort(labels, kind='stable')[len(labels) - int(sizes.sum()):]
+        boundaries = numpy.cumsum(sizes)[:-1]
+        return {frozenset(component.tolist()) for component in numpy.split(vertices_by_label, boundaries)}
+
     connected_components = set()
-    connected_component_vertices = set()
-    visited_vertex_map = {v: False for v in graph.vertices}
-    for vertex in visited_vertex_map:
-        visited = visited_vertex_map[vertex]
-        if not visited:
-            dfs_visit_vertex(graph, vertex, visited_vertex_map,
-                             visited_edges=None,
-                             visited_vertices=connected_component_vertices)
-            if not connected_component_vertices:
-                connected_component_vertices.add(vertex)
-            connected_components.add(frozenset(connected_component_vertices))
-            connected_component_vertices = set()
+    visited_vertices = set()
+    for vertex in graph.vertices:
+        if vertex not in visited_vertices:
+            connected_component_vertices = frozenset(dfs_pre_order(graph, [vertex], visited_vertices))
+            connected_components.add(connected_component_vertices)
 
     return connected_components
 
 
 def is_graph_connected(graph: Graph):
-    connected_components = dfs_connected_components(graph)
-    return len(connected_components) == 1
+    # Dla grafu skierowanego: czy wszystkie wierzchołki są osiągalne z pierwszego wierzchołka
+    # (przeszukiwanie po łukach wychodzących). Dla nieskierowanego: łączenie składowych
+    # wzdłuż krawędzi, zakończone, gdy zostanie jedna składowa.
+    if not graph.vertices:
+        return False
+    if graph.directed:
+        start_vertex = next(iter(graph.vertices))
+        return sum(1 for _ in dfs_pre_order(graph, [start_vertex])) == len(graph.vertices)
+    if use_frontier_engine(graph):
+        return frontier_reached_count(graph, next(iter(graph.vertices))) == len(graph.vertices)
+    connected_components = UnionFind(graph.adjacency.vertex_count)
+    # Numery spoza zbioru wierzchołków tworzą osobne, jednoelementowe składowe
+    missing_vertices = graph.adjacency.vertex_count - len(graph.vertices)
+    for u, v in graph.edges:
+        if connected_components.component_count - missing_vertices == 1:
+            break
+        connected_components.union(u, v)
+    return connected_components.component_count - missing_vertices == 1
 
 
 if __name__ == '__main__':
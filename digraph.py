@@ -2,16 +2,46 @@ from graph import Graph
 
 
 class Digraph(Graph):
-    def __init__(self, vertices: set, edges: list):
-        super(Digraph, self).__init__(vertices=vertices, edges=edges)
+    directed = True
+
+    def __init__(self, vertices: set, edges: list, storage: str = None, weights: list = None):
+        super(Digraph, self).__init__(vertices=vertices, edges=edges, storage=storage, weights=weights)
 
     def transpose(self):
         transposed_edges = [(edge[1], edge[0]) for edge in self.edges]
-        return Digraph(vertices=set(self.vertices), edges=transposed_edges)
+        return Digraph(vertices=set(self.vertices), edges=transposed_edges, storage=self.storage)
+
+    @property
+    def out_degrees(self):
+        return self.adjacency.out_degrees
+
+    @property
+    def in_degrees(self):
+        return self.adjacency.in_degrees
+
+    def get_vertex_predecessors(self, vertex: int) -> set:
+        if vertex not in self.vertices:
+            raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(vertex))
+        return self.adjacency.predecessors(vertex)
+
+    def get_vertex_out_degree(self, vertex: int) -> int:
+        return self.get_vertex_degree(vertex)
+
+    def get_vertex_in_degree(self, vertex: int) -> int:
+        if vertex not in self.vertices:
+            raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(vertex))
+        return self.adjacency.in_degree(vertex)
+
+    def get_min_vertex_in_degree(self) -> int:
+        self._check_not_empty()
+        return self.adjacency.in_histogram.minimum(self._missing_vertex_count())
+
+    def get_max_vertex_in_degree(self) -> int:
+        self._check_not_empty()
+        return self.adjacency.in_histogram.max_degree
 
-    def _create_n_matrix(self):
-        matrix = [[0 for _ in range(len(self.vertices))] for _ in range(len(self.vertices))]
-        for edge in self.edges:
-            matrix[edge[0]][edge[1]] += 1
+    def get_in_degree_histogram(self) -> list:
+        return self.adjacency.in_histogram.histogram(self._missing_vertex_count())
 
-        return matrix
+    def get_sorted_vertex_in_degree_list(self) -> list:
+        return self.adjacency.in_histogram.sorted_degrees(self._missing_vertex_count())
@@ -1,21 +1,39 @@
+from array import array
 from math import inf
-from typing import Tuple
+from typing import NamedTuple, Tuple
 
+from adjacency import build_csr
 from console_input_utils import int_value_from_cli, weighted_edges_from_cli
 from weighted_graph import WeightedGraph
 from digraph import Digraph
+from traversal import dfs_post_order
+
+
+class CycleError(ValueError):
+    def __init__(self, cycle: list):
+        super().__init__('Sieć zawiera cykl: {}.'.format(cycle))
+        self.cycle = cycle
+
+
+class Schedule(NamedTuple):
+    # Kolumny wyrównane z listą zadań (łuków sieci)
+    tasks: list
+    earliest_start: list
+    latest_start: list
+    slack: list
+    critical: list
 
 
 class DirectedNetwork(WeightedGraph, Digraph):
-    def __init__(self, vertices: set, edges: list, weights: list, start_vertex: int, end_vertex: int):
+    def __init__(self, vertices: set, edges: list, weights: list, start_vertex: int, end_vertex: int,
+                 storage: str = None):
         if start_vertex not in vertices or end_vertex not in vertices:
             raise ValueError('Podane punkty startowe i końcowe nie należą do sieci.')
 
         self.start_vertex = start_vertex
         self.end_vertex = end_vertex
-        self.weights = weights
 
-        super().__init__(vertices=vertices, edges=edges, weights=weights)
+        super().__init__(vertices=vertices, edges=edges, weights=weights, storage=storage)
 
         if not self.get_vertex_neighbours(self.start_vertex):
             raise ValueError('Podany punkt startowy nie jest źródłem.')
@@ -32,30 +50,30 @@ class DirectedNetwork(WeightedGraph, Digraph):
         return cls(vertices=vertices, edges=edges, weights=weights,
                    start_vertex=start_vertex, end_vertex=end_vertex)
 
-    def get_vertex_predecessors(self, vertex: int) -> set:
-        if vertex not in self.vertices:
-            raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(vertex))
-        predecessors = set()
-        for edge in self.edges:
-            if edge[1] == vertex:
-                predecessors.add(edge[0])
-        return predecessors
+    def remove_vertices(self, vertices) -> dict:
+        removed_vertices = set(vertices)
+        if self.start_vertex in removed_vertices or self.end_vertex in removed_vertices:
+            raise ValueError('Nie można usunąć źródła ani ujścia sieci.')
+        id_map = super().remove_vertices(removed_vertices)
+        self.start_vertex = id_map.get(self.start_vertex, self.start_vertex)
+        self.end_vertex = id_map.get(self.end_vertex, self.end_vertex)
+        return id_map
 
     def get_shortest_path_map(self, start: int) -> dict:
         if start not in self.vertices:
             raise ValueError('Podane punkt startowy nie należy do sieci.')
-        topological_sort = dfs_topological_sort(self)
         shortest_paths_map = {vertex: inf for vertex in self.vertices if vertex != start}
         shortest_paths_map[start] = 0
 
-        while topological_sort:
-            vertex = topological_sort.pop()
+        for vertex in topological_sort(self):
             if vertex == start:
                 continue
             predecessors = self.get_vertex_predecessors(vertex)
             if predecessors:
-                shortest_paths_map[vertex] = min(shortest_paths_map[predecessor] + self.weight_map[(predecessor, vertex)]
-                                                 for predecessor in predecessors)
+                # Relaksacja po najlżejszej z kopii łuku
+                shortest_paths_map[vertex] = min(shortest_paths_map[predecessor] + weight
+                                                 for predecessor in predecessors
+                                                 for weight in self.edges.weights_of((predecessor, vertex)))
         return shortest_paths_map
 
     def get_longest_path_map(self, start: int) -> dict:
@@ -65,7 +83,8 @@ class DirectedNetwork(WeightedGraph, Digraph):
         weights_changed_signs = [-w for w in self.weights]
         helper_network = DirectedNetwork(edges=self.edges, vertices=self.vertices,
                                          weights=weights_changed_signs,
-                                         start_vertex=self.start_vertex, end_vertex=self.end_vertex)
+                                         start_vertex=self.start_vertex, end_vertex=self.end_vertex,
+                                         storage=self.storage)
         longest_paths_map_in_helper_network = helper_network.get_shortest_path_map(start)
         longest_paths_map = {vertex: -length for vertex, length in longest_paths_map_in_helper_network.items()}
         return longest_paths_map
@@ -76,39 +95,128 @@ class DirectedNetwork(WeightedGraph, Digraph):
 
         return self.get_longest_path_map(start=start)[end]
 
-    def get_process_minimal_finish_time(self) -> int:
-        return self.get_longest_path(start=self.start_vertex, end=self.end_vertex)
+    def get_event_times(self) -> Tuple[list, list]:
+        # Najwcześniejsze i najpóźniejsze czasy zdarzeń (wierzchołków): jedno przejście
+        # w przód i jedno wstecz po tym samym porządku topologicznym
+        tasks = list(self.edges)
+        durations = self.edges.weights
+        offsets, heads, task_indices = build_csr(self.adjacency.vertex_count, tasks, directed=True,
+                                                 weights=list(range(len(tasks))))
+        topological_order = topological_sort(self)
 
-    def get_task_minimal_start_time(self, task: Tuple[int, int]) -> int:
-        return self.get_longest_path(start=self.start_vertex, end=task[0])
+        earliest_times = [-inf for _ in range(self.adjacency.vertex_count)]
+        earliest_times[self.start_vertex] = 0
+        for vertex in topological_order:
+            vertex_time = earliest_times[vertex]
+            if vertex_time == -inf:
+                continue
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                time = vertex_time + durations[task_indices[i]]
+                if time > earliest_times[heads[i]]:
+                    earliest_times[heads[i]] = time
+
+        latest_times = [inf for _ in range(self.adjacency.vertex_count)]
+        latest_times[self.end_vertex] = earliest_times[self.end_vertex]
+        for vertex in reversed(topological_order):
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                time = latest_times[heads[i]] - durations[task_indices[i]]
+                if time < latest_times[vertex]:
+                    latest_times[vertex] = time
 
-    def get_task_maximal_start_time(self, task: Tuple[int, int]) -> int:
-        return self.get_process_minimal_finish_time() - self.get_longest_path(start=task[1], end=self.end_vertex)\
-               - self.weight_map[task]
+        return earliest_times, latest_times
 
+    def compute_schedule(self) -> Schedule:
+        earliest_times, latest_times = self.get_event_times()
+        tasks = list(self.edges)
+        earliest_start = [earliest_times[task[0]] for task in tasks]
+        latest_start = [latest_times[task[1]] - duration for task, duration in zip(tasks, self.edges.weights)]
+        slack = [latest - earliest for earliest, latest in zip(earliest_start, latest_start)]
+        critical = [task_slack == 0 for task_slack in slack]
+        return Schedule(tasks=tasks, earliest_start=earliest_start, latest_start=latest_start,
+                        slack=slack, critical=critical)
+
+    def get_process_minimal_finish_time(self) -> int:
+        earliest_times, _ = self.get_event_times()
+        return earliest_times[self.end_vertex]
 
-def dfs_visit_vertex_topological_sort(network: DirectedNetwork,
-                                      vertex, visited_vertex_map: dict,
-                                      visited_vertices: list):
-    visited_vertex_map[vertex] = True
-    for neighbour_vertex in network.get_vertex_neighbours(vertex):
-        visited = visited_vertex_map[neighbour_vertex]
-        if not visited:
-            dfs_visit_vertex_topological_sort(network, neighbour_vertex, visited_vertex_map,
-                                              visited_vertices)
+    # Zadanie to pozycja łuku na liście edges (jak w Schedule.tasks) albo para (u, v);
+    # dla łuków równoległych para oznacza najstarszą kopię (EdgeStore.slot)
+    def get_task_minimal_start_time(self, task: Tuple[int, int] or int) -> int:
+        earliest_times, _ = self.get_event_times()
+        return earliest_times[self.edges[self.edges.slot(task)][0]]
 
-    visited_vertices.append(vertex)
+    def get_task_maximal_start_time(self, task: Tuple[int, int] or int) -> int:
+        _, latest_times = self.get_event_times()
+        slot = self.edges.slot(task)
+        return latest_times[self.edges[slot][1]] - self.edges.weights[slot]
 
 
 def dfs_topological_sort(network: DirectedNetwork) -> list:
-    visited_vertex_map = {vertex: False for vertex in network.vertices}
-    topological_sort = []
-    for vertex in network.vertices:
-        if not visited_vertex_map[vertex]:
-            dfs_visit_vertex_topological_sort(network, vertex, visited_vertex_map,
-                                              visited_vertices=topological_sort)
+    # Wierzchołki w kolejności post-order, czyli w odwróconym porządku topologicznym
+    return list(dfs_post_order(network, network.vertices))
+
+
+def event_levels(graph: Digraph) -> list:
+    # Algorytm Kahna na tablicy stopni wejściowych, wykonywany rundami: poziom k to zdarzenia
+    # (wierzchołki), których wszyscy poprzednicy leżą na poziomach < k. Zdarzenia jednego poziomu
+    # tworzą antyłańcuch. Dla grafu z cyklem zgłaszany jest CycleError ze świadkiem.
+    offsets, targets = build_csr(graph.adjacency.vertex_count, graph.edges, directed=True)
+    in_degrees = array('q', graph.adjacency.in_degrees)
+    level = sorted(v for v in graph.vertices if in_degrees[v] == 0)
+    levels = []
+    sorted_count = 0
+    while level:
+        levels.append(level)
+        sorted_count += len(level)
+        next_level = []
+        for vertex in level:
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                in_degrees[targets[i]] -= 1
+                if in_degrees[targets[i]] == 0:
+                    next_level.append(targets[i])
+        level = next_level
+
+    if sorted_count != len(graph.vertices):
+        raise CycleError(_find_cycle(graph, in_degrees))
+    return levels
+
+
+def task_levels(graph: Digraph) -> list:
+    # Zadania (łuki) pogrupowane według poziomu zdarzenia początkowego, jako pozycje na liście
+    # edges (jednoznaczne także dla łuków równoległych). Zadanie zależy tylko od zadań kończących
+    # się w jego zdarzeniu początkowym, a te leżą na niższych poziomach, więc zadania jednego
+    # poziomu można wykonywać równolegle; liczność poziomu to osiągalna współbieżność.
+    vertex_levels = array('q', [-1]) * graph.adjacency.vertex_count
+    levels = event_levels(graph)
+    for level_index, level in enumerate(levels):
+        for vertex in level:
+            vertex_levels[vertex] = level_index
+    tasks_by_level = [[] for _ in levels]
+    for slot, (u, _) in enumerate(graph.edges):
+        tasks_by_level[vertex_levels[u]].append(slot)
+    return [level for level in tasks_by_level if level]
+
+
+def topological_sort(graph: Digraph) -> list:
+    return [vertex for level in event_levels(graph) for vertex in level]
+
 
-    return topological_sort
+def _find_cycle(graph: Digraph, in_degrees: array) -> list:
+    # Wierzchołki, które nie trafiły do porządku, mają nieprzetworzonego poprzednika;
+    # cofanie się po takich poprzednikach musi w końcu powtórzyć wierzchołek
+    predecessor_offsets, predecessors = build_csr(graph.adjacency.vertex_count,
+                                                  [(v, u) for u, v in graph.edges], directed=True)
+    vertex = next(v for v in graph.vertices if in_degrees[v] > 0)
+    walk_position = {}
+    walk = []
+    while vertex not in walk_position:
+        walk_position[vertex] = len(walk)
+        walk.append(vertex)
+        vertex = next(predecessors[i] for i in range(predecessor_offsets[vertex], predecessor_offsets[vertex + 1])
+                      if in_degrees[predecessors[i]] > 0)
+    cycle = walk[walk_position[vertex]:]
+    cycle.reverse()
+    return cycle
 
 
 if __name__ == '__main__':
@@ -138,7 +246,13 @@ if __name__ == '__main__':
 
     print('Minimalny czas realizacji: {}'.format(network.get_process_minimal_finish_time()))
     print('Porządek topologiczny: {}'.format(dfs_topological_sort(network)))
-    for task in network.edges:
-        print('Minimalny czas rozpoczęcia zadania {}: {}'.format(task, network.get_task_minimal_start_time(task)))
-        print('Maksymalny czas rozpoczęcia zadania {}: {}\n'.format(task, network.get_task_maximal_start_time(task)))
+    print('Poziomy zdarzeń: {}'.format(event_levels(network)))
+    print('Poziomy zadań niezależnych: {}'.format(
+        [[network.edges[slot] for slot in level] for level in task_levels(network)]))
+    schedule = network.compute_schedule()
+    for i, task in enumerate(schedule.tasks):
+        print('Minimalny czas rozpoczęcia zadania {}: {}'.format(task, schedule.earliest_start[i]))
+        print('Maksymalny czas rozpoczęcia zadania {}: {}'.format(task, schedule.latest_start[i]))
+        print('Zapas czasu zadania {}: {}{}\n'.format(task, schedule.slack[i],
+                                                     ' (ścieżka krytyczna)' if schedule.critical[i] else ''))
 
@@ -1,3 +1,6 @@
+from array import array
+
+
 class DisjointSet:
     def __init__(self, v):
         self.v = v
@@ -22,8 +25,88 @@ def union(x: DisjointSet, y: DisjointSet):
 
 
 def find(x: DisjointSet):
-    if x.parent == x:
+    root = x
+    while root.parent != root:
+        root = root.parent
+    while x.parent != root:
+        x.parent, x = root, x.parent
+    return root
+
+
+class UnionFind:
+    # Zbiory rozłączne na płaskich tablicach elementów 0..n-1:
+    # łączenie według rozmiaru i skracanie ścieżek przez połowienie
+    def __init__(self, size: int):
+        self.parent = array('q', range(size))
+        self.size = array('q', [1]) * size
+        self.component_count = size
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add_element(self) -> int:
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        self.component_count += 1
+        return len(self.parent) - 1
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
         return x
-    else:
-        x.parent = find(x.parent)
-        return x.parent
+
+    def union(self, x: int, y: int) -> bool:
+        x_root = self.find(x)
+        y_root = self.find(y)
+        if x_root == y_root:
+            return False
+        if self.size[x_root] < self.size[y_root]:
+            x_root, y_root = y_root, x_root
+        self.parent[y_root] = x_root
+        self.size[x_root] += self.size[y_root]
+        self.component_count -= 1
+        return True
+
+    def union_many(self, edges) -> list:
+        # Dla każdej krawędzi informacja, czy połączyła dwie różne składowe
+        parent, size = self.parent, self.size
+        merged = []
+        for x, y in edges:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            while parent[y] != y:
+                parent[y] = parent[parent[y]]
+                y = parent[y]
+            if x == y:
+                merged.append(False)
+                continue
+            if size[x] < size[y]:
+                x, y = y, x
+            parent[y] = x
+            size[x] += size[y]
+            self.component_count -= 1
+            merged.append(True)
+        return merged
+
+    def connected(self, x: int, y: int) -> bool:
+        return self.find(x) == self.find(y)
+
+    def component_size(self, x: int) -> int:
+        return self.size[self.find(x)]
+
+    def component_sizes(self) -> dict:
+        return {x: self.size[x] for x in range(len(self.parent)) if self.parent[x] == x}
+
+    def labels(self) -> array:
+        # Numer składowej (0, 1, ...) dla każdego elementu, w kolejności pierwszego wystąpienia
+        labels = array('q', [-1]) * len(self.parent)
+        root_labels = {}
+        for x in range(len(self.parent)):
+            root = self.find(x)
+            if root not in root_labels:
+                root_labels[root] = len(root_labels)
+            labels[x] = root_labels[root]
+        return labels
@@ -0,0 +1,233 @@
+from math import inf
+from typing import Tuple
+
+from kruskal import minimum_spanning_tree
+from weighted_graph import WeightedGraph
+
+
+class DynamicMinimumSpanningForest:
+    # Minimalny las rozpinający utrzymywany przy dodawaniu krawędzi. Las przechowywany jest
+    # w drzewie link-cut, w którym każda krawędź lasu jest osobnym węzłem z wagą krawędzi,
+    # a wierzchołki grafu mają wagę -inf. Maksimum na ścieżce między końcami nowej krawędzi
+    # wskazuje krawędź do wymiany; każda operacja kosztuje zamortyzowane O(log V).
+    def __init__(self, graph: WeightedGraph, engine: str = None):
+        self.graph = graph
+        self.left = []
+        self.right = []
+        self.parent = []
+        self.reversed = bytearray()
+        self.value = []
+        self.max_node = []
+        self.edge_ends = []
+        self.free_nodes = []
+        self.vertex_nodes = []
+        self.forest_nodes = {}
+        self.total_weight = 0
+
+        spanning_edge_indices, _ = minimum_spanning_tree(graph, engine=engine, edges_only=True)
+        for edge_index in spanning_edge_indices:
+            u, v = graph.edges[edge_index]
+            self._link_edge(u, v, graph.edges.weights[edge_index])
+
+    def __len__(self):
+        return len(self.forest_nodes)
+
+    def forest_edges(self) -> list:
+        return [self.edge_ends[node] for node in self.forest_nodes]
+
+    def weighted_forest_edges(self) -> list:
+        return [(self.edge_ends[node], self.value[node]) for node in self.forest_nodes]
+
+    def connected(self, u: int, v: int) -> bool:
+        return u == v or self._find_root(self._vertex_node(u)) == self._find_root(self._vertex_node(v))
+
+    def path_max(self, u: int, v: int) -> Tuple[tuple, float] or None:
+        # Najcięższa krawędź lasu na ścieżce u - v (None, gdy u i v są w różnych drzewach)
+        if not self.connected(u, v) or u == v:
+            return None
+        node = self._path_max_node(self._vertex_node(u), self._vertex_node(v))
+        return self.edge_ends[node], self.value[node]
+
+    def add_edge(self, edge: tuple, weight=1) -> Tuple[bool, tuple or None]:
+        # Dodaje krawędź do grafu i poprawia las. Zwraca informację, czy krawędź weszła do lasu,
+        # oraz krawędź, która została z niego usunięta.
+        self.graph.add_edge(edge, weight)
+        u, v = edge
+        if u == v:
+            return False, None
+        u_node, v_node = self._vertex_node(u), self._vertex_node(v)
+        if self._find_root(u_node) != self._find_root(v_node):
+            self._link_edge(u, v, weight)
+            return True, None
+
+        heaviest = self._path_max_node(u_node, v_node)
+        if self.value[heaviest] <= weight:
+            return False, None
+        replaced_edge = self.edge_ends[heaviest]
+        self._cut_edge(heaviest)
+        self._link_edge(u, v, weight)
+        return True, replaced_edge
+
+    def add_edges(self, edges, weights: list = None) -> list:
+        edges = list(edges)
+        if weights is None:
+            weights = [1 for _ in edges]
+        if len(weights) != len(edges):
+            raise ValueError('Liczba wag nie odpowiada liczbie krawędzi.')
+        return [self.add_edge(edge, weight) for edge, weight in zip(edges, weights)]
+
+    def _new_node(self, value) -> int:
+        if self.free_nodes:
+            node = self.free_nodes.pop()
+            self.left[node] = self.right[node] = self.parent[node] = -1
+            self.reversed[node] = 0
+            self.value[node] = value
+            self.max_node[node] = node
+            return node
+        node = len(self.value)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(-1)
+        self.reversed.append(0)
+        self.value.append(value)
+        self.max_node.append(node)
+        self.edge_ends.append(None)
+        return node
+
+    def _vertex_node(self, vertex: int) -> int:
+        while len(self.vertex_nodes) <= vertex:
+            self.vertex_nodes.append(self._new_node(-inf))
+        return self.vertex_nodes[vertex]
+
+    def _link_edge(self, u: int, v: int, weight):
+        node = self._new_node(weight)
+        self.edge_ends[node] = (u, v)
+        self.forest_nodes[node] = None
+        self.total_weight += weight
+        self._link(node, self._vertex_node(u))
+        self._link(self._vertex_node(v), node)
+
+    def _cut_edge(self, node: int):
+        u, v = self.edge_ends[node]
+        self._cut(node, self._vertex_node(u))
+        self._cut(node, self._vertex_node(v))
+        del self.forest_nodes[node]
+        self.total_weight -= self.value[node]
+        self.edge_ends[node] = None
+        self.free_nodes.append(node)
+
+    def _is_splay_root(self, node: int) -> bool:
+        parent = self.parent[node]
+        return parent < 0 or (self.left[parent] != node and self.right[parent] != node)
+
+    def _push(self, node: int):
+        if self.reversed[node]:
+            left, right = self.left[node], self.right[node]
+            self.left[node], self.right[node] = right, left
+            if left >= 0:
+                self.reversed[left] ^= 1
+            if right >= 0:
+                self.reversed[right] ^= 1
+            self.reversed[node] = 0
+
+    def _update(self, node: int):
+        best = node
+        for child in (self.left[node], self.right[node]):
+            if child >= 0 and self.value[self.max_node[child]] > self.value[best]:
+                best = self.max_node[child]
+        self.max_node[node] = best
+
+    def _rotate(self, node: int):
+        parent = self.parent[node]
+        grandparent = self.parent[parent]
+        if not self._is_splay_root(parent):
+            if self.left[grandparent] == parent:
+                self.left[grandparent] = node
+            else:
+                self.right[grandparent] = node
+        if self.left[parent] == node:
+            child = self.right[node]
+            self.left[parent] = child
+            self.right[node] = parent
+        else:
+            child = self.left[node]
+            self.right[parent] = child
+            self.left[node] = parent
+        if child >= 0:
+            self.parent[child] = parent
+        self.parent[parent] = node
+        self.parent[node] = grandparent
+        self._update(parent)
+        self._update(node)
+
+    def _splay(self, node: int):
+        path = [node]
+        while not self._is_splay_root(path[-1]):
+            path.append(self.parent[path[-1]])
+        for path_node in reversed(path):
+            self._push(path_node)
+
+        while not self._is_splay_root(node):
+            parent = self.parent[node]
+            if not self._is_splay_root(parent):
+                grandparent = self.parent[parent]
+                if (self.left[grandparent] == parent) == (self.left[parent] == node):
+                    self._rotate(parent)
+                else:
+                    self._rotate(node)
+            self._rotate(node)
+
+    def _access(self, node: int):
+        previous = -1
+        current = node
+        while current >= 0:
+            self._splay(current)
+            self.right[current] = previous
+            self._update(current)
+            previous = current
+            current = self.parent[current]
+        self._splay(node)
+
+    def _make_root(self, node: int):
+        self._access(node)
+        self.reversed[node] ^= 1
+        self._push(node)
+
+    def _find_root(self, node: int) -> int:
+        self._access(node)
+        while True:
+            self._push(node)
+            if self.left[node] < 0:
+                break
+            node = self.left[node]
+        self._splay(node)
+        return node
+
+    def _link(self, node: int, parent: int):
+        self._make_root(node)
+        self.parent[node] = parent
+
+    def _cut(self, node: int, neighbour: int):
+        self._make_root(node)
+        self._access(neighbour)
+        self.left[neighbour] = -1
+        self.parent[node] = -1
+        self._update(neighbour)
+
+    def _path_max_node(self, u_node: int, v_node: int) -> int:
+        self._make_root(u_node)
+        self._access(v_node)
+        return self.max_node[v_node]
+
+
+if __name__ == '__main__':
+    test_graph = WeightedGraph(vertices={0, 1, 2, 3, 4},
+                               edges=[(0, 1), (1, 2), (2, 3), (3, 4)],
+                               weights=[4, 7, 2, 5])
+    dynamic_forest = DynamicMinimumSpanningForest(test_graph)
+    print('Waga lasu: {}, krawędzie: {}'.format(dynamic_forest.total_weight, dynamic_forest.forest_edges()))
+    for new_edge, new_weight in (((0, 2), 3), ((1, 4), 9), ((0, 4), 1)):
+        added, replaced_edge = dynamic_forest.add_edge(new_edge, new_weight)
+        print('Krawędź {} (waga {}): dodana do lasu: {}, usunięta krawędź: {}'.format(new_edge, new_weight,
+                                                                                  added, replaced_edge))
+    print('Waga lasu: {}, krawędzie: {}'.format(dynamic_forest.total_weight, dynamic_forest.forest_edges()))
@@ -0,0 +1,151 @@
+from collections.abc import Mapping
+
+
+class EdgeStore:
+    # Lista krawędzi z indeksem: krawędź -> pozycje jej kopii oraz wierzchołek -> krawędzie incydentne.
+    # Usuwanie przenosi ostatnią krawędź na zwolnione miejsce, więc kolejność krawędzi nie jest stała,
+    # ale wagi zawsze zajmują te same pozycje co odpowiadające im krawędzie.
+    def __init__(self, edges=(), weights=None):
+        self._edges = []
+        self._weights = []
+        self._slots = {}
+        self._incident = {}
+        if weights is None and isinstance(edges, EdgeStore):
+            weights = edges.weights
+        self.add_edges(edges, weights)
+
+    def __len__(self):
+        return len(self._edges)
+
+    def __iter__(self):
+        return iter(self._edges)
+
+    def __getitem__(self, index):
+        return self._edges[index]
+
+    def __contains__(self, edge):
+        return edge in self._slots
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(self._edges)
+
+    @property
+    def weights(self) -> list:
+        return self._weights
+
+    def weighted_edges(self):
+        return zip(self._edges, self._weights)
+
+    def count(self, edge) -> int:
+        return len(self._slots.get(edge, ()))
+
+    def weights_of(self, edge) -> list:
+        return [self._weights[slot] for slot in self._slots.get(edge, ())]
+
+    def slots(self, edge) -> list:
+        # Pozycje kopii krawędzi od najstarszej; usuwana jest zawsze najnowsza kopia
+        return list(self._slots.get(edge, ()))
+
+    def slot(self, edge) -> int:
+        # Krawędź wskazana pozycją na liście albo parą (u, v), która oznacza najstarszą kopię
+        if isinstance(edge, int):
+            if not 0 <= edge < len(self._edges):
+                raise ValueError('Krawędź o numerze {} nie należy do grafu.'.format(edge))
+            return edge
+        slots = self._slots.get(tuple(edge))
+        if not slots:
+            raise ValueError('Krawędź {} nie należy do grafu.'.format(edge))
+        return slots[0]
+
+    def weight(self, edge):
+        return self._weights[self.slot(edge)]
+
+    def set_weight(self, edge, weight):
+        self._weights[self.slot(edge)] = weight
+
+    def incident(self, vertex: int):
+        for edge in self._incident.get(vertex, ()):
+            for _ in self._slots[edge]:
+                yield edge
+
+    def append(self, edge, weight=1):
+        edge = tuple(edge)
+        self._slots.setdefault(edge, []).append(len(self._edges))
+        self._edges.append(edge)
+        self._weights.append(weight)
+        self._incident.setdefault(edge[0], {})[edge] = None
+        self._incident.setdefault(edge[1], {})[edge] = None
+
+    def extend(self, edges):
+        self.add_edges(edges)
+
+    def add_edges(self, edges, weights=None):
+        if weights is None:
+            for edge in edges:
+                self.append(edge)
+            return
+        edges = list(edges)
+        if len(edges) != len(weights):
+            raise ValueError('Liczba wag nie odpowiada liczbie krawędzi.')
+        for edge, weight in zip(edges, weights):
+            self.append(edge, weight)
+
+    def remove(self, edge):
+        edge = tuple(edge)
+        slots = self._slots.get(edge)
+        if not slots:
+            raise ValueError('Krawędź {} nie należy do grafu.'.format(edge))
+        slot = slots.pop()
+        weight = self._weights[slot]
+        if not slots:
+            del self._slots[edge]
+            del self._incident[edge[0]][edge]
+            if edge[1] != edge[0]:
+                del self._incident[edge[1]][edge]
+
+        last_slot = len(self._edges) - 1
+        if slot != last_slot:
+            moved_edge = self._edges[last_slot]
+            moved_slots = self._slots[moved_edge]
+            moved_slots[moved_slots.index(last_slot)] = slot
+            self._edges[slot] = moved_edge
+            self._weights[slot] = self._weights[last_slot]
+        self._edges.pop()
+        self._weights.pop()
+        return weight
+
+    def remove_edges(self, edges) -> list:
+        return [self.remove(edge) for edge in edges]
+
+    def copy(self):
+        return EdgeStore(self)
+
+
+class WeightMap(Mapping):
+    # Widok wag krawędzi po ich końcach. Dla krawędzi wielokrotnych klucz (u, v) oznacza
+    # najstarszą kopię (jak EdgeStore.slot); wagi pozostałych kopii są dostępne przez
+    # EdgeStore.weights_of albo po pozycji krawędzi.
+    def __init__(self, edge_store: EdgeStore):
+        self._edge_store = edge_store
+
+    def __getitem__(self, edge):
+        if edge not in self._edge_store:
+            raise KeyError(edge)
+        return self._edge_store.weight(edge)
+
+    def __setitem__(self, edge, weight):
+        if edge not in self._edge_store:
+            raise KeyError(edge)
+        self._edge_store.set_weight(edge, weight)
+
+    def __iter__(self):
+        return iter(self._edge_store._slots)
+
+    def __len__(self):
+        return len(self._edge_store._slots)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
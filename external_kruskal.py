@@ -0,0 +1,148 @@
+import os
+import tempfile
+from heapq import merge
+from itertools import islice
+from operator import itemgetter
+from typing import Tuple
+
+from disjoint_set import UnionFind
+
+# Domyślna liczba krawędzi sortowanych jednocześnie w pamięci
+DEFAULT_BUFFER_EDGES = 1000000
+# Maksymalna liczba plików pośrednich scalanych w jednym przebiegu
+DEFAULT_MERGE_FAN_IN = 64
+
+
+def _parse_weight(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _edge_fields(edges_file, field_counts: tuple):
+    # Pola kolejnych krawędzi rozdzielone przecinkami lub białymi znakami; puste wiersze są pomijane
+    for line in edges_file:
+        fields = line.replace(',', ' ').split()
+        if not fields:
+            continue
+        if len(fields) not in field_counts:
+            raise ValueError('Krawędź {} ma niepoprawny format.'.format(line.strip()))
+        yield fields
+
+
+def read_weighted_edges(edges_file):
+    # Krawędzie w formacie v1,v2,waga (jak przy wczytywaniu z konsoli) lub rozdzielone białymi znakami
+    for fields in _edge_fields(edges_file, (3,)):
+        yield int(fields[0]), int(fields[1]), _parse_weight(fields[2])
+
+
+def read_edges(edges_file):
+    # Krawędzie w formacie v1,v2; w pliku z wagami (v1,v2,waga) wagi są pomijane
+    for fields in _edge_fields(edges_file, (2, 3)):
+        yield int(fields[0]), int(fields[1])
+
+
+def _remove_runs(run_paths: list):
+    for run_path in run_paths:
+        if os.path.exists(run_path):
+            os.remove(run_path)
+
+
+def _write_run(edges, temp_dir: str or None) -> str:
+    file_descriptor, path = tempfile.mkstemp(prefix='kruskal_run_', suffix='.txt', dir=temp_dir)
+    try:
+        with os.fdopen(file_descriptor, 'w') as run_file:
+            run_file.writelines('{},{},{}\n'.format(u, v, weight) for u, v, weight in edges)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _merge_runs(run_paths: list, temp_dir: str or None) -> str:
+    # Pliki wejściowe usuwane są dopiero po udanym scaleniu, żeby przy błędzie
+    # sprzątał je wywołujący razem z pozostałymi plikami
+    run_files = []
+    try:
+        for path in run_paths:
+            run_files.append(open(path))
+        merged_path = _write_run(merge(*(read_weighted_edges(run_file) for run_file in run_files),
+                                       key=itemgetter(2)), temp_dir)
+    finally:
+        for run_file in run_files:
+            run_file.close()
+    _remove_runs(run_paths)
+    return merged_path
+
+
+def sort_edges_to_runs(edges, buffer_edges: int = DEFAULT_BUFFER_EDGES,
+                       merge_fan_in: int = DEFAULT_MERGE_FAN_IN, temp_dir: str = None) -> list:
+    # Sortowanie zewnętrzne: posortowane fragmenty po buffer_edges krawędzi, scalane
+    # wielokrotnie, dopóki plików pośrednich jest więcej niż merge_fan_in. Przy błędzie
+    # wczytywania, sortowania lub scalania wszystkie utworzone pliki są usuwane.
+    run_paths = []
+    merged_paths = []
+    try:
+        while True:
+            chunk = list(islice(edges, buffer_edges))
+            if not chunk:
+                break
+            chunk.sort(key=itemgetter(2))
+            run_paths.append(_write_run(chunk, temp_dir))
+            del chunk
+
+        while len(run_paths) > merge_fan_in:
+            merged_paths = []
+            for i in range(0, len(run_paths), merge_fan_in):
+                merged_paths.append(_merge_runs(run_paths[i:i + merge_fan_in], temp_dir))
+            run_paths, merged_paths = merged_paths, []
+    except BaseException:
+        _remove_runs(run_paths + merged_paths)
+        raise
+    return run_paths
+
+
+def external_kruskal(edges_path: str, output_path: str, vertex_count: int = None,
+                     buffer_edges: int = DEFAULT_BUFFER_EDGES, merge_fan_in: int = DEFAULT_MERGE_FAN_IN,
+                     temp_dir: str = None) -> Tuple[int, float]:
+    # Minimalny las rozpinający dla krawędzi z pliku. W pamięci trzymany jest tylko
+    # bufor sortowania i UnionFind (O(V)); krawędzie lasu zapisywane są do output_path.
+    # Zwraca liczbę krawędzi lasu i jego łączną wagę.
+    # Pliki pośrednie powstają w katalogu tymczasowym usuwanym razem z nimi także przy błędzie.
+    vertices_disjoint_sets = UnionFind(vertex_count or 0)
+    forest_edge_count = 0
+    forest_weight = 0
+    with tempfile.TemporaryDirectory(prefix='kruskal_', dir=temp_dir) as run_dir:
+        with open(edges_path) as edges_file:
+            run_paths = sort_edges_to_runs(read_weighted_edges(edges_file), buffer_edges=buffer_edges,
+                                           merge_fan_in=merge_fan_in, temp_dir=run_dir)
+        run_files = []
+        try:
+            for path in run_paths:
+                run_files.append(open(path))
+            sorted_edges = merge(*(read_weighted_edges(run_file) for run_file in run_files), key=itemgetter(2))
+            with open(output_path, 'w') as output_file:
+                for u, v, weight in sorted_edges:
+                    while len(vertices_disjoint_sets) <= max(u, v):
+                        if vertex_count is not None:
+                            raise ValueError('Wierzcholki {} nie naleza do grafu.'.format((u, v)))
+                        vertices_disjoint_sets.add_element()
+                    if vertices_disjoint_sets.union(u, v):
+                        output_file.write('{},{},{}\n'.format(u, v, weight))
+                        forest_edge_count += 1
+                        forest_weight += weight
+                        if vertex_count is not None and vertices_disjoint_sets.component_count == 1:
+                            break
+        finally:
+            for run_file in run_files:
+                run_file.close()
+
+    return forest_edge_count, forest_weight
+
+
+if __name__ == '__main__':
+    input_path = input('Podaj ścieżkę pliku z krawędziami (v1,v2,waga): ')
+    output_path = input('Podaj ścieżkę pliku wynikowego: ')
+    edge_count, weight = external_kruskal(input_path, output_path)
+    print('Krawędzie lasu rozpinającego: {}, łączna waga: {}'.format(edge_count, weight))
@@ -0,0 +1,155 @@
+from itertools import chain
+
+from graph import Graph
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Liczba wierzchołków, od której (przy dostępnym numpy) składowe liczone są na tablicach
+FRONTIER_MIN_VERTICES = 10000
+# Liczba kandydatów na źródła BFS odfiltrowywanych naraz przy wyznaczaniu składowych
+FRONTIER_SEED_CHUNK = 4096
+
+
+def _check_numpy():
+    if numpy is None:
+        raise ValueError('Przeszukiwanie na tablicach wymaga biblioteki numpy.')
+
+
+def _edge_arrays(graph: Graph, symmetric: bool = False) -> tuple:
+    # Końce łuków; krawędzie nieskierowane (i wszystkie dla symmetric) występują w obu kierunkach
+    edge_ends = numpy.fromiter(chain.from_iterable(graph.edges), dtype=numpy.int64,
+                               count=2 * len(graph.edges)).reshape(-1, 2)
+    tails, heads = edge_ends[:, 0], edge_ends[:, 1]
+    if symmetric or not graph.directed:
+        tails, heads = numpy.concatenate((tails, heads)), numpy.concatenate((heads, tails))
+    return tails, heads
+
+
+def numpy_csr(graph: Graph, symmetric: bool = False) -> tuple:
+    _check_numpy()
+    vertex_count = graph.adjacency.vertex_count
+    tails, heads = _edge_arrays(graph, symmetric)
+    offsets = numpy.zeros(vertex_count + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(tails, minlength=vertex_count), out=offsets[1:])
+    targets = heads[numpy.argsort(tails, kind='stable')]
+    return offsets, targets
+
+
+def _frontier_search(offsets, targets, frontier, distances, parents=None, labels=None, label: int = 0) -> int:
+    # BFS poziomami: cały front rozwijany jest naraz (gather sąsiadów z tablic CSR, scatter
+    # odległości, rodziców i etykiety). Tablice wypełniane są w miejscu; wierzchołki z odległością
+    # >= 0 uznawane są za odwiedzone. Zwraca liczbę osiągniętych wierzchołków (łącznie ze źródłami).
+    distances[frontier] = 0
+    if labels is not None:
+        labels[frontier] = label
+    reached_count = len(frontier)
+    level = 0
+    while len(frontier):
+        level += 1
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            break
+        # Pozycje wszystkich łuków wychodzących z frontu: start łuku + numer łuku w obrębie wierzchołka
+        first_positions = numpy.cumsum(counts) - counts
+        positions = numpy.repeat(starts - first_positions, counts) + numpy.arange(total)
+        candidates = targets[positions]
+        candidate_parents = numpy.repeat(frontier, counts)
+        unvisited = distances[candidates] < 0
+        candidates, candidate_parents = candidates[unvisited], candidate_parents[unvisited]
+        frontier, first_occurrence = numpy.unique(candidates, return_index=True)
+        distances[frontier] = level
+        if parents is not None:
+            parents[frontier] = candidate_parents[first_occurrence]
+        if labels is not None:
+            labels[frontier] = label
+        reached_count += len(frontier)
+    return reached_count
+
+
+def frontier_bfs(graph: Graph, sources, csr=None) -> tuple:
+    # Zwraca tablice odległości i rodziców, -1 dla nieosiągniętych.
+    # sources może być jednym wierzchołkiem albo listą (BFS z wielu źródeł).
+    _check_numpy()
+    offsets, targets = csr if csr is not None else numpy_csr(graph)
+    frontier = numpy.unique(numpy.atleast_1d(numpy.asarray(sources, dtype=numpy.int64)))
+    for source in frontier:
+        if int(source) not in graph.vertices:
+            raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(int(source)))
+    vertex_count = len(offsets) - 1
+    distances = numpy.full(vertex_count, -1, dtype=numpy.int64)
+    parents = numpy.full(vertex_count, -1, dtype=numpy.int64)
+    _frontier_search(offsets, targets, frontier, distances, parents)
+    return distances, parents
+
+
+def frontier_reached_count(graph: Graph, source: int, csr=None) -> int:
+    # Liczba wierzchołków osiągalnych z source (łącznie z nim)
+    _check_numpy()
+    if source not in graph.vertices:
+        raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(source))
+    offsets, targets = csr if csr is not None else numpy_csr(graph)
+    distances = numpy.full(len(offsets) - 1, -1, dtype=numpy.int64)
+    return _frontier_search(offsets, targets, numpy.array([source], dtype=numpy.int64), distances)
+
+
+def frontier_connected_components(graph: Graph) -> tuple:
+    # Składowe (dla grafu skierowanego - słabo spójne) wyznaczane frontowym BFS z każdego
+    # nieodwiedzonego wierzchołka. Zwraca etykiety składowych 0..k-1 (w kolejności najmniejszych
+    # wierzchołków, -1 poza zbiorem wierzchołków) oraz rozmiary składowych.
+    _check_numpy()
+    offsets, targets = numpy_csr(graph, symmetric=True)
+    vertex_count = len(offsets) - 1
+    distances = numpy.full(vertex_count, -1, dtype=numpy.int64)
+    labels = numpy.full(vertex_count, -1, dtype=numpy.int64)
+    is_vertex = numpy.zeros(vertex_count, dtype=bool)
+    is_vertex[numpy.fromiter(graph.vertices, dtype=numpy.int64, count=len(graph.vertices))] = True
+
+    # Wierzchołki izolowane są osobnymi składowymi bez uruchamiania BFS
+    has_edges = offsets[1:] != offsets[:-1]
+    isolated_vertices = numpy.flatnonzero(is_vertex & ~has_edges)
+    distances[isolated_vertices] = 0
+
+    # Źródło BFS każdej składowej jest jej najmniejszym wierzchołkiem, bo kandydaci
+    # przeglądani są rosnąco. Nieodwiedzeni wybierani są porcjami, żeby pętla w Pythonie
+    # obejmowała głównie źródła kolejnych składowych, a nie wszystkie wierzchołki.
+    seeds = []
+    sizes = []
+    candidates = numpy.flatnonzero(is_vertex & has_edges)
+    for start in range(0, len(candidates), FRONTIER_SEED_CHUNK):
+        chunk = candidates[start:start + FRONTIER_SEED_CHUNK]
+        for seed in chunk[distances[chunk] < 0].tolist():
+            if distances[seed] >= 0:
+                continue
+            sizes.append(_frontier_search(offsets, targets, numpy.array([seed], dtype=numpy.int64), distances,
+                                          labels=labels, label=len(seeds)))
+            seeds.append(seed)
+    labels[isolated_vertices] = numpy.arange(len(seeds), len(seeds) + len(isolated_vertices))
+
+    # Numeracja składowych według najmniejszych wierzchołków
+    seeds = numpy.concatenate((numpy.array(seeds, dtype=numpy.int64), isolated_vertices))
+    sizes = numpy.concatenate((numpy.array(sizes, dtype=numpy.int64),
+                               numpy.ones(len(isolated_vertices), dtype=numpy.int64)))
+    order = numpy.argsort(seeds, kind='stable')
+    ranks = numpy.empty(len(seeds), dtype=numpy.int64)
+    ranks[order] = numpy.arange(len(seeds))
+    labels[is_vertex] = ranks[labels[is_vertex]]
+    return labels, sizes[order]
+
+
+def use_frontier_engine(graph: Graph) -> bool:
+    return numpy is not None and not graph.directed and graph.adjacency.vertex_count >= FRONTIER_MIN_VERTICES
+
+
+if __name__ == '__main__':
+    test_graph = Graph(vertices={0, 1, 2, 3, 4, 5, 6, 7},
+                       edges=[(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (6, 6)])
+    test_distances, test_parents = frontier_bfs(test_graph, 0)
+    print('Odległości od wierzchołka 0: {}'.format(test_distances.tolist()))
+    print('Rodzice: {}'.format(test_parents.tolist()))
+    test_labels, test_sizes = frontier_connected_components(test_graph)
+    print('Etykiety składowych: {}, rozmiary: {}'.format(test_labels.tolist(), test_sizes.tolist()))
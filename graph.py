@@ -1,21 +1,26 @@
-from pprint import pformat
-import operator
+from collections import Counter
+
+from adjacency import choose_storage, create_adjacency
+from edge_store import EdgeStore
+from triangles import has_triangle
 
 
 class Graph:
-    def __init__(self, vertices: set, edges: list):
+    directed = False
+
+    def __init__(self, vertices: set, edges: list, storage: str = None, weights: list = None):
         self.vertices = vertices
-        self.edges = edges
-        self.n_matrix = self._create_n_matrix()
+        self.edges = EdgeStore(edges, weights)
+        self.storage = storage or choose_storage(self._vertex_capacity(), len(self.edges))
+        self.adjacency = self._create_adjacency()
 
     @classmethod
     def create_from_graph_sequence(cls, sequence: list):
         if not is_graph_sequence(sequence):
             raise ValueError('Ciąg: {} nie jest ciągem grafowym.'.format(sequence))
 
-        vertex_degree_map = {vertex_index: degree for vertex_index, degree in enumerate(sequence)}
         vertices = {i for i, _ in enumerate(sequence)}
-        edges = cls.create_edges_from_vertex_degree_map(vertex_degree_map)
+        edges = list(havel_hakimi_edges(sequence))
 
         return cls(vertices=vertices, edges=edges)
 
@@ -45,160 +50,229 @@ class Graph:
         return cls(vertices=vertices, edges=edges)
 
     def __str__(self):
-        return pformat(self.n_matrix)
-
-    @staticmethod
-    def _create_edges_from_vertex_degree_map(vertex_degree_map: dict, edges: list):
-        max_vertex = max(vertex_degree_map, key=vertex_degree_map.get)
-        max_vertex_degree = vertex_degree_map[max_vertex]
-        if max_vertex_degree == 0:
-            return
-
-        vertices_sorted_by_degree = [(vertex, degree) for vertex, degree in
-                                     reversed(sorted(vertex_degree_map.items(), key=operator.itemgetter(1)))]
-        vertices_to_connect = [vertex for vertex, degree in
-                               vertices_sorted_by_degree
-                               if degree > 0 and vertex != max_vertex]
-        for vertex in vertices_to_connect[:max_vertex_degree]:
-            edges.append((max_vertex, vertex))
-            vertex_degree_map[vertex] -= 1
+        return str(self.adjacency)
 
-        vertex_degree_map[max_vertex] = 0
-
-        Graph._create_edges_from_vertex_degree_map(vertex_degree_map, edges)
+    @property
+    def n_matrix(self) -> list:
+        return self.adjacency.to_matrix()
 
     @staticmethod
     def create_edges_from_vertex_degree_map(vertex_degree_map: dict) -> list:
-        edges = []
-        Graph._create_edges_from_vertex_degree_map(vertex_degree_map, edges)
-        return edges
+        vertices = list(vertex_degree_map)
+        return [(vertices[u], vertices[v])
+                for u, v in havel_hakimi_edges([vertex_degree_map[vertex] for vertex in vertices])]
 
-    def _create_n_matrix(self):
-        matrix = [[0 for _ in range(len(self.vertices))] for _ in range(len(self.vertices))]
-        for edge in self.edges:
-            matrix[edge[0]][edge[1]] += 1
-            matrix[edge[1]][edge[0]] += 1
+    def _vertex_capacity(self) -> int:
+        # Wierzchołki indeksują tablice sąsiedztwa, więc rozmiar wyznacza największy z nich
+        return max(self.vertices) + 1 if self.vertices else 0
 
-        return matrix
+    def _create_adjacency(self):
+        return create_adjacency(self.storage, self._vertex_capacity(), self.edges, directed=self.directed)
 
     def add_vertex(self) -> int:
-        new_vertex_index = len(self.vertices)
+        new_vertex_index = self.adjacency.add_vertex()
         self.vertices.add(new_vertex_index)
-        # self.n_matrix.append([0 for _ in range(len(vertices))])
-        # for neighbours_list in self.n_matrix:
-        #     neighbours_list.append(0)
-        self.n_matrix = self._create_n_matrix()
         return new_vertex_index
 
-    def add_edge(self, edge: tuple):
+    def add_vertices(self, count: int) -> list:
+        new_vertices = self.adjacency.add_vertices(count)
+        self.vertices.update(new_vertices)
+        return new_vertices
+
+    def add_edge(self, edge: tuple, weight=1):
         if edge[0] not in self.vertices or edge[1] not in self.vertices:
             raise ValueError('Wierzcholki {} nie naleza do grafu.'.format(edge))
-        self.edges.append(edge)
-        self.n_matrix[edge[0]][edge[1]] += 1
-        self.n_matrix[edge[1]][edge[0]] += 1
-
-    def remove_vertex(self, vertex: int):
-        if vertex not in self.vertices:
-            raise ValueError('Wierzchołek {} nie należy do grafu.'.format(vertex))
-
-        corrected_edges = []
-
-        for edge in self.edges:
-            if vertex in edge:
-                self.edges.remove(edge)
-            elif edge[0] > vertex or edge[1] > vertex:
-                corrected_edge = (edge[0], edge[1])
-                if edge[0] > vertex:
-                    corrected_edge = (corrected_edge[0] - 1, corrected_edge[1])
-                if edge[1] > vertex:
-                    corrected_edge = (corrected_edge[0], corrected_edge[1] - 1)
-                corrected_edges.append(corrected_edge)
-                self.edges.remove(edge)
-
-        self.edges += corrected_edges
-
-        self.vertices = {i for i in range(len(self.vertices) - 1)}
-        self.n_matrix = self._create_n_matrix()
+        self.edges.append(edge, weight)
+        self.adjacency.add_edge(edge[0], edge[1])
+
+    def add_edges(self, edges, weights: list = None):
+        edges = list(edges)
+        if weights is None:
+            weights = [1 for _ in edges]
+        elif len(weights) != len(edges):
+            raise ValueError('Liczba wag nie odpowiada liczbie krawędzi.')
+        for edge, weight in zip(edges, weights):
+            self.add_edge(edge, weight)
+
+    def remove_vertex(self, vertex: int) -> dict:
+        return self.remove_vertices([vertex])
+
+    def remove_vertices(self, vertices) -> dict:
+        # Usuwane wierzchołki zastępowane są ostatnimi (swap-with-last), dzięki czemu
+        # numeracja pozostaje ciągła. Zwracana mapa: stary numer -> nowy numer przeniesionych wierzchołków.
+        removed_vertices = set(vertices)
+        for vertex in removed_vertices:
+            if vertex not in self.vertices:
+                raise ValueError('Wierzchołek {} nie należy do grafu.'.format(vertex))
+
+        id_map = {}
+        slot_owners = {}
+        last_vertex = self.adjacency.vertex_count - 1
+        for vertex in sorted(removed_vertices, reverse=True):
+            if vertex != last_vertex:
+                moved_vertex = slot_owners.pop(last_vertex, last_vertex)
+                slot_owners[vertex] = moved_vertex
+                if moved_vertex in self.vertices:
+                    id_map[moved_vertex] = vertex
+            last_vertex -= 1
+
+        for vertex in removed_vertices:
+            for edge in list(self.edges.incident(vertex)):
+                self._remove_edge(edge)
+        for moved_vertex in id_map:
+            for edge in list(self.edges.incident(moved_vertex)):
+                weight = self._remove_edge(edge)
+                edge = (id_map.get(edge[0], edge[0]), id_map.get(edge[1], edge[1]))
+                self.edges.append(edge, weight)
+                self.adjacency.add_edge(edge[0], edge[1])
+
+        self.vertices -= removed_vertices
+        self.vertices -= id_map.keys()
+        self.vertices.update(id_map.values())
+        self.adjacency.remove_last_vertices(len(removed_vertices))
+        return id_map
+
+    def _remove_edge(self, edge: tuple):
+        weight = self.edges.remove(edge)
+        self.adjacency.remove_edge(edge[0], edge[1])
+        return weight
 
     def remove_edge(self, edge: tuple):
         if edge not in self.edges:
             raise ValueError('Krawędź {} nie należy do grafu.'.format(edge))
 
-        self.edges.remove(edge)
-        self.n_matrix[edge[0]][edge[1]] -= 1
-        self.n_matrix[edge[1]][edge[0]] -= 1
+        return self._remove_edge(edge)
+
+    def remove_edges(self, edges) -> list:
+        edges = list(edges)
+        for edge, count in Counter(edges).items():
+            if self.edges.count(edge) < count:
+                raise ValueError('Krawędź {} nie należy do grafu.'.format(edge))
+        return [self._remove_edge(edge) for edge in edges]
 
     def get_vertex_neighbours(self, vertex: int) -> set:
         if vertex not in self.vertices:
             raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(vertex))
-        neighbours = set()
-        for v, edge_count in enumerate(self.n_matrix[vertex]):
-            if edge_count > 0:
-                neighbours.add(v)
-        return neighbours
+        return self.adjacency.neighbours(vertex)
 
     def get_vertex_degree(self, vertex: int):
         if vertex not in self.vertices:
             raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(vertex))
-        return sum(edge_count for edge_count in self.n_matrix[vertex])
+        return self.adjacency.degree(vertex)
+
+    def _missing_vertex_count(self) -> int:
+        # Pozycje tablic sąsiedztwa bez wierzchołka mają stopień 0 i nie wchodzą do statystyk
+        return self.adjacency.vertex_count - len(self.vertices)
+
+    def _check_not_empty(self):
+        if not self.vertices:
+            raise ValueError('Graf nie zawiera wierzchołków.')
 
     def get_min_vertex_degree(self):
-        return min(self.get_vertex_degree(vertex) for vertex in self.vertices)
+        self._check_not_empty()
+        return self.adjacency.out_histogram.minimum(self._missing_vertex_count())
 
     def get_max_vertex_degree(self):
-        return max(self.get_vertex_degree(vertex) for vertex in self.vertices)
+        self._check_not_empty()
+        return self.adjacency.out_histogram.max_degree
 
     def get_odd_vertices_count(self):
-        return sum(1 for vertex in self.vertices if self.get_vertex_degree(vertex) % 2 != 0)
+        return self.adjacency.out_histogram.odd_count
 
     def get_even_vertices_count(self):
-        return sum(1 for vertex in self.vertices if self.get_vertex_degree(vertex) % 2 == 0)
+        return len(self.vertices) - self.adjacency.out_histogram.odd_count
+
+    def get_degree_histogram(self) -> list:
+        # histogram[d] - liczba wierzchołków stopnia d
+        return self.adjacency.out_histogram.histogram(self._missing_vertex_count())
 
     def get_sorted_vertex_degree_list(self):
-        vertex_degrees = [self.get_vertex_degree(vertex) for vertex in self.vertices]
-        sorted_vertex_degrees = list(reversed(sorted(vertex_degrees)))
-        return sorted_vertex_degrees
+        return self.adjacency.out_histogram.sorted_degrees(self._missing_vertex_count())
 
 
 # 1.2
 # Podgraf izomorficzny do cyklu C3
 def is_graph_c3_free(graph: Graph) -> bool:
-    if len(graph.vertices) < 3:
-        return True
-
-    for vertex in graph.vertices:
-
-        if graph.get_vertex_degree(vertex) >= 2:
-            for neighbour_vertex in graph.get_vertex_neighbours(vertex):
-                if graph.get_vertex_degree(neighbour_vertex) >= 2:
-                    if graph.get_vertex_neighbours(vertex).intersection(graph.get_vertex_neighbours(neighbour_vertex)):
-                        # Jeśli oba wierzchołki stopnia co najmniej 2 mają tego samego sąsiada
-                        # (zbiór wspólny sąsiadów jest niepusty), to
-                        # graf zawiera podgraf izomorficzny do cyklu C3
-                        return False
-
-    return True
+    # Graf zawiera podgraf izomorficzny do cyklu C3 dokładnie wtedy, gdy zawiera trójkąt
+    return not has_triangle(graph)
 
 
 # 1.3
-# Sprawdzenie, czy ciąg liczb naturalnych jest ciągem grafowym
+# Sprawdzenie, czy ciąg liczb naturalnych jest ciągem grafowym (twierdzenie Erdősa–Gallaia)
 def is_graph_sequence(sequence: list) -> bool:
+    vertex_count = len(sequence)
+    if any(degree < 0 or degree >= vertex_count for degree in sequence) or sum(sequence) % 2:
+        return False
 
-    # sortowanie ciągu nierosnąco
-    sequence = list(reversed((sorted(sequence))))
+    # Sortowanie przez zliczanie: degree_counts[d] - liczba wierzchołków stopnia d
+    degree_counts = [0 for _ in range(vertex_count + 1)]
+    for degree in sequence:
+        degree_counts[degree] += 1
+    sorted_sequence = [degree for degree in range(vertex_count - 1, -1, -1) for _ in range(degree_counts[degree])]
+
+    # at_least[k] - liczba stopni >= k, below_sum[k] - suma stopni < k
+    at_least = [0 for _ in range(vertex_count + 2)]
+    for degree in range(vertex_count, -1, -1):
+        at_least[degree] = at_least[degree + 1] + degree_counts[degree]
+    below_sum = [0 for _ in range(vertex_count + 1)]
+    for degree in range(1, vertex_count + 1):
+        below_sum[degree] = below_sum[degree - 1] + (degree - 1) * degree_counts[degree - 1]
+
+    total = sum(sorted_sequence)
+    prefix_sum = 0
+    for k in range(1, vertex_count + 1):
+        prefix_sum += sorted_sequence[k - 1]
+        # Suma min(d_i, k) po i > k: stopnie >= k spoza pierwszych k dają po k, pozostałe - swoją wartość
+        if at_least[k] >= k:
+            tail_sum = k * (at_least[k] - k) + below_sum[k]
+        else:
+            tail_sum = total - prefix_sum
+        if prefix_sum > k * (k - 1) + tail_sum:
+            return False
+    return True
 
-    if sequence[0] == 0:
-        return True
 
-    degrees_to_reduce = [l for l in sequence[1:] if l > 0]
-    if len(degrees_to_reduce) < sequence[0]:
-        # Ciąg nie jest graficzny, jeśli liczba stopni w ciągu
-        # nie wystarcza do połączenia z wierzchołkiem o najwyższym stopniu
-        return False
-
-    # Wywołanie procedury rekurencyjnie ze zredukowaną listą stopni
-    reduced_sequence = [0] + [degree - 1 for degree in degrees_to_reduce]
-    return is_graph_sequence(reduced_sequence)
+def havel_hakimi_edges(sequence: list):
+    # Iteracyjny algorytm Havla–Hakimiego: wierzchołek o największym stopniu łączony jest z d
+    # kolejnymi wierzchołkami o największych stopniach. Wierzchołki trzymane są w tablicy
+    # posortowanej nierosnąco według stopnia, podzielonej na kubełki; zmniejszenie stopnia
+    # to zamiana z ostatnim elementem kubełka i przesunięcie jego granicy, więc całość to O(n + E).
+    vertex_count = len(sequence)
+    if any(degree < 0 or degree >= vertex_count for degree in sequence):
+        raise ValueError('Ciąg: {} nie jest ciągem grafowym.'.format(sequence))
+    degrees = list(sequence)
+    degree_counts = [0 for _ in range(vertex_count + 1)]
+    for degree in degrees:
+        degree_counts[degree] += 1
+    # bucket_end[d] - pozycja za ostatnim wierzchołkiem stopnia d (liczba wierzchołków stopnia >= d)
+    bucket_end = [0 for _ in range(vertex_count + 1)]
+    running_count = 0
+    for degree in range(vertex_count - 1, -1, -1):
+        running_count += degree_counts[degree]
+        bucket_end[degree] = running_count
+    order = [0 for _ in range(vertex_count)]
+    next_free = [bucket_end[degree] - degree_counts[degree] for degree in range(vertex_count)]
+    for vertex, degree in enumerate(degrees):
+        order[next_free[degree]] = vertex
+        next_free[degree] += 1
+
+    for head in range(vertex_count):
+        vertex = order[head]
+        degree = degrees[vertex]
+        if degree == 0:
+            return
+        if head + degree >= vertex_count or degrees[order[head + degree]] == 0:
+            raise ValueError('Ciąg: {} nie jest ciągem grafowym.'.format(sequence))
+        degrees[vertex] = 0
+        for neighbour_position in range(head + degree, head, -1):
+            neighbour_vertex = order[neighbour_position]
+            neighbour_degree = degrees[neighbour_vertex]
+            last_position = bucket_end[neighbour_degree] - 1
+            last_vertex = order[last_position]
+            order[neighbour_position], order[last_position] = last_vertex, neighbour_vertex
+            bucket_end[neighbour_degree] -= 1
+            degrees[neighbour_vertex] -= 1
+            yield vertex, neighbour_vertex
 
 
 def test_graph():
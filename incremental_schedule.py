@@ -0,0 +1,196 @@
+from heapq import heappop, heappush
+from math import inf
+from typing import Tuple
+
+from directed_network import CycleError, DirectedNetwork, Schedule, topological_sort
+from traversal import dfs_path
+
+
+class IncrementalSchedule:
+    # Harmonogram sieci utrzymywany przy zmianach czasów zadań i zależności.
+    # Dla każdego zdarzenia przechowywane są: najdłuższa ścieżka od źródła (head)
+    # i najdłuższa ścieżka do ujścia (tail), a także porządek topologiczny.
+    # Po zmianie przeliczane są tylko wierzchołki, których wartości faktycznie się zmieniają.
+    def __init__(self, network: DirectedNetwork):
+        self.network = network
+        self.order = topological_sort(network)
+        self.position = [0 for _ in range(network.adjacency.vertex_count)]
+        for index, vertex in enumerate(self.order):
+            self.position[vertex] = index
+
+        self.head = [-inf for _ in range(network.adjacency.vertex_count)]
+        self.tail = [-inf for _ in range(network.adjacency.vertex_count)]
+        for vertex in self.order:
+            self.head[vertex] = self._compute_head(vertex)
+        for vertex in reversed(self.order):
+            self.tail[vertex] = self._compute_tail(vertex)
+
+    @property
+    def finish_time(self):
+        return self.head[self.network.end_vertex]
+
+    def _latest_time(self, vertex: int):
+        # Zdarzenia, z których nie da się dojść do ujścia, nie ograniczają harmonogramu
+        tail = self.tail[vertex]
+        return inf if tail == -inf else self.finish_time - tail
+
+    def event_times(self) -> Tuple[list, list]:
+        return list(self.head), [self._latest_time(vertex) for vertex in range(len(self.tail))]
+
+    # Zadanie to pozycja łuku na liście edges sieci albo para (u, v), która dla łuków
+    # równoległych oznacza najstarszą kopię (EdgeStore.slot)
+    def earliest_start(self, task: Tuple[int, int] or int):
+        return self.head[self.network.edges[self.network.edges.slot(task)][0]]
+
+    def latest_start(self, task: Tuple[int, int] or int):
+        edges = self.network.edges
+        slot = edges.slot(task)
+        return self._latest_time(edges[slot][1]) - edges.weights[slot]
+
+    def slack(self, task: Tuple[int, int] or int):
+        return self.latest_start(task) - self.earliest_start(task)
+
+    def schedule(self) -> Schedule:
+        tasks = list(self.network.edges)
+        earliest_start = [self.head[task[0]] for task in tasks]
+        latest_start = [self._latest_time(task[1]) - duration
+                        for task, duration in zip(tasks, self.network.edges.weights)]
+        slack = [latest - earliest for earliest, latest in zip(earliest_start, latest_start)]
+        critical = [task_slack == 0 for task_slack in slack]
+        return Schedule(tasks=tasks, earliest_start=earliest_start, latest_start=latest_start,
+                        slack=slack, critical=critical)
+
+    def add_event(self) -> int:
+        vertex = self.network.add_vertex()
+        self.position.append(len(self.order))
+        self.order.append(vertex)
+        self.head.append(-inf)
+        self.tail.append(-inf)
+        return vertex
+
+    def set_duration(self, task: Tuple[int, int] or int, duration):
+        edges = self.network.edges
+        slot = edges.slot(task)
+        edges.set_weight(slot, duration)
+        self._propagate(edges[slot])
+
+    def add_task(self, task: Tuple[int, int], duration):
+        u, v = task
+        if u not in self.network.vertices or v not in self.network.vertices:
+            raise ValueError('Wierzcholki {} nie naleza do grafu.'.format(task))
+        if u == self.network.end_vertex:
+            raise ValueError('Podany punkt końcowy nie jest ujściem.')
+        if self.position[u] >= self.position[v]:
+            self._reorder(u, v)
+        self.network.add_edge(task, duration)
+        self._propagate(task)
+
+    def remove_task(self, task: Tuple[int, int]):
+        if task[0] == self.network.start_vertex and self.network.adjacency.degree(task[0]) == 1:
+            raise ValueError('Podany punkt startowy nie jest źródłem.')
+        duration = self.network.remove_edge(task)
+        self._propagate(task)
+        return duration
+
+    def _reorder(self, u: int, v: int):
+        # Pearce-Kelly: naprawa porządku po dodaniu łuku u -> v, gdy position[u] > position[v].
+        # Przesuwane są tylko wierzchołki pomiędzy v i u osiągalne z v lub prowadzące do u.
+        upper_bound, lower_bound = self.position[u], self.position[v]
+        adjacency = self.network.adjacency
+
+        def bounded_successors(vertex):
+            return {w for w in adjacency.neighbours(vertex) if self.position[w] <= upper_bound}
+
+        def bounded_predecessors(vertex):
+            return {w for w in adjacency.predecessors(vertex) if self.position[w] >= lower_bound}
+
+        cycle = dfs_path(self.network, v, u, neighbours=bounded_successors)
+        if cycle is not None:
+            raise CycleError(cycle)
+
+        forward = self._reachable(v, bounded_successors)
+        backward = self._reachable(u, bounded_predecessors)
+        shifted_vertices = sorted(backward, key=self.position.__getitem__) \
+            + sorted(forward, key=self.position.__getitem__)
+        free_positions = sorted(self.position[vertex] for vertex in shifted_vertices)
+        for vertex, index in zip(shifted_vertices, free_positions):
+            self.position[vertex] = index
+            self.order[index] = vertex
+
+    @staticmethod
+    def _reachable(vertex: int, neighbours) -> set:
+        reached = {vertex}
+        stack = [vertex]
+        while stack:
+            for w in neighbours(stack.pop()):
+                if w not in reached:
+                    reached.add(w)
+                    stack.append(w)
+        return reached
+
+    def _compute_head(self, vertex: int):
+        if vertex == self.network.start_vertex:
+            return 0
+        edges = self.network.edges
+        return max((self.head[u] + duration
+                    for u in self.network.adjacency.predecessors(vertex)
+                    for duration in edges.weights_of((u, vertex))), default=-inf)
+
+    def _compute_tail(self, vertex: int):
+        if vertex == self.network.end_vertex:
+            return 0
+        edges = self.network.edges
+        return max((duration + self.tail[w]
+                    for w in self.network.adjacency.neighbours(vertex)
+                    for duration in edges.weights_of((vertex, w))), default=-inf)
+
+    def _propagate(self, task: Tuple[int, int]):
+        # Zmiana łuku u -> v wpływa na head potomków v i na tail przodków u;
+        # wierzchołki przetwarzane są w porządku topologicznym (odpowiednio odwróconym)
+        u, v = task
+        heap = [(self.position[v], v)]
+        while heap:
+            _, vertex = heappop(heap)
+            head = self._compute_head(vertex)
+            if head != self.head[vertex]:
+                self.head[vertex] = head
+                for w in self.network.adjacency.neighbours(vertex):
+                    heappush(heap, (self.position[w], w))
+            while heap and heap[0][1] == vertex:
+                heappop(heap)
+
+        heap = [(-self.position[u], u)]
+        while heap:
+            _, vertex = heappop(heap)
+            tail = self._compute_tail(vertex)
+            if tail != self.tail[vertex]:
+                self.tail[vertex] = tail
+                for w in self.network.adjacency.predecessors(vertex):
+                    heappush(heap, (-self.position[w], w))
+            while heap and heap[0][1] == vertex:
+                heappop(heap)
+
+
+if __name__ == '__main__':
+    test_network = DirectedNetwork(edges=[(0, 1), (0, 3),
+                                          (3, 1), (3, 4),
+                                          (1, 2), (2, 4),
+                                          (2, 5), (4, 5)
+                                          ],
+                                   weights=[1, 2, 4, 3, 6, 1, 4, 1],
+                                   vertices=set([i for i in range(0, 6)]),
+                                   start_vertex=0,
+                                   end_vertex=5
+                                   )
+    incremental_schedule = IncrementalSchedule(test_network)
+    print('Minimalny czas realizacji: {}'.format(incremental_schedule.finish_time))
+    incremental_schedule.set_duration((3, 4), 20)
+    print('Minimalny czas realizacji po wydłużeniu zadania (3, 4): {}'.format(incremental_schedule.finish_time))
+    incremental_schedule.remove_task((3, 4))
+    print('Minimalny czas realizacji po usunięciu zadania (3, 4): {}'.format(incremental_schedule.finish_time))
+    try:
+        incremental_schedule.add_task((4, 3), 1)
+        incremental_schedule.add_task((2, 0), 1)
+    except CycleError as error:
+        print('Odrzucona zmiana: {}'.format(error))
+    print('Harmonogram: {}'.format(incremental_schedule.schedule()))
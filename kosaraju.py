@@ -1,65 +1,44 @@
-from random import choice
+from typing import Tuple
 
 from digraph import Digraph
-from dfs import dfs_visit_vertex
+from traversal import dfs_post_order, dfs_pre_order
 
 
-def dfs_visit_vertex_kosaraju(graph: Digraph, vertex, visited_vertex_map: dict,
-                              visited_edges: list or None,
-                              visited_vertices: list):
-    for neighbour_vertex in graph.get_vertex_neighbours(vertex):
-        visited = visited_vertex_map[neighbour_vertex]
-        if not visited:
-            visited_vertex_map[neighbour_vertex] = True
-            dfs_visit_vertex_kosaraju(graph, neighbour_vertex, visited_vertex_map,
-                                      visited_edges, visited_vertices)
-    if vertex not in visited_vertices:
-        visited_vertices.append(vertex)
+def strongly_connected_components(graph: Digraph) -> Tuple[list, list]:
+    # Pierwsze przeszukanie wyznacza kolejność przetwarzania (malejące czasy zakończenia),
+    # drugie - po poprzednikach, czyli po grafie transponowanym - odwiedza kolejne silnie spójne składowe.
+    # Składowe zwracane są w porządku topologicznym grafu składowych.
+    vertex_stack = list(dfs_post_order(graph, sorted(graph.vertices)))  # S
 
+    connected_components = []
+    component_index = [-1 for _ in range(graph.adjacency.vertex_count)]
+    visited_vertices = set()
+    while vertex_stack:
+        top_stack_vertex = vertex_stack.pop()
+        if top_stack_vertex in visited_vertices:
+            continue
+        connected_component = set(dfs_pre_order(graph, [top_stack_vertex], visited_vertices,
+                                                  neighbours=graph.adjacency.predecessors))
+        for vertex in connected_component:
+            component_index[vertex] = len(connected_components)
+        connected_components.append(connected_component)
 
-def dfs_kosaraju(graph: Digraph, root_vertex, vertex_stack: list, visited_vertex_map: dict):
-    if root_vertex not in graph.vertices:
-        raise ValueError('Wierzchołek startowy nie należy do grafu.')
-
-    dfs_visit_vertex_kosaraju(graph, root_vertex, visited_vertex_map,
-                              visited_edges=None,
-                              visited_vertices=vertex_stack)
-
+    return connected_components, component_index
 
-def kosaraju(graph: Digraph) -> list:
-    connected_components = []
-    vertex_stack = []  # S
-    visited_vertex_map = {v: False for v in graph.vertices}
 
-    while len(vertex_stack) < len(graph.vertices):
-        # dfs_vertex = 3
-        # dfs_vertex = 0
-        dfs_vertex = choice(list(graph.vertices - set(vertex_stack)))
-        dfs_kosaraju(graph, dfs_vertex, vertex_stack=vertex_stack,
-                     visited_vertex_map=visited_vertex_map)
+def condensation(graph: Digraph, connected_components: list, component_index: list) -> Digraph:
+    component_edges = {(component_index[u], component_index[v]) for u, v in graph.edges
+                       if component_index[u] != component_index[v]}
+    return Digraph(vertices=set(range(len(connected_components))), edges=sorted(component_edges))
 
-    #vertex_stack = list(reversed(vertex_stack))
-    transposed_graph = graph.transpose()
-    visited_vertex_map_t = {v: False for v in transposed_graph.vertices}
 
-    while vertex_stack:
-        top_stack_vertex = vertex_stack.pop()
-        connected_component = list()
-        dfs_kosaraju(transposed_graph, top_stack_vertex, connected_component,
-                     visited_vertex_map_t)
-        connected_component = set(connected_component)
-        connected_components.append(connected_component)
+def kosaraju_condensation(graph: Digraph) -> Tuple[list, list, Digraph]:
+    connected_components, component_index = strongly_connected_components(graph)
+    return connected_components, component_index, condensation(graph, connected_components, component_index)
 
-        remaining_edges = [edge for edge in transposed_graph.edges
-                           if edge[0] and edge[1] not in connected_component]
-        transposed_graph = Digraph(edges=remaining_edges,
-                                   vertices=transposed_graph.vertices)
-        for component_vertex in connected_component:
-            try:
-                vertex_stack.remove(component_vertex)
-            except ValueError:
-                continue
 
+def kosaraju(graph: Digraph) -> list:
+    connected_components, _ = strongly_connected_components(graph)
     return connected_components
 
 
@@ -74,3 +53,6 @@ if __name__ == '__main__':
                                   (8, 7)])
     # g = Digraph.create_from_user_input()
     print('Składowe spójności: {}'.format(kosaraju(test_digraph)))
+    components, component_index, condensed_digraph = kosaraju_condensation(test_digraph)
+    print('Numery składowych: {}'.format(component_index))
+    print('Łuki grafu składowych: {}'.format(condensed_digraph.edges))
@@ -1,28 +1,165 @@
-import disjoint_set
+from array import array
+from heapq import heapify, heappop, heappush
+
+from adjacency import build_csr
+from disjoint_set import UnionFind
 from tree import Tree
 from weighted_graph import WeightedGraph
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-def kruskal(graph: WeightedGraph):
-    min_spanning_tree_edges = set()
-    vertices_disjoint_sets = {vertex: disjoint_set.make_set(vertex) for vertex in graph.vertices}
+# Gęstość (E / (V·(V-1)/2)), od której drzewo wyznaczane jest algorytmem Prima
+PRIM_MIN_DENSITY = 0.1
+# Liczba krawędzi, od której (przy dostępnym numpy) używany jest algorytm Borůvki
+BORUVKA_MIN_EDGES = 1000000
+
+
+def kruskal_edge_indices(graph: WeightedGraph) -> array:
+    weights = graph.edges.weights
+    sorted_indices = sorted(range(len(graph.edges)), key=weights.__getitem__)
+    vertices_disjoint_sets = UnionFind(graph.adjacency.vertex_count)
+    merged = vertices_disjoint_sets.union_many(graph.edges[i] for i in sorted_indices)
+    return array('q', (i for i, edge_merged in zip(sorted_indices, merged) if edge_merged))
+
+
+def prim_edge_indices(graph: WeightedGraph) -> array:
+    weights = graph.edges.weights
+    offsets, targets, edge_indices = build_csr(graph.adjacency.vertex_count, graph.edges, directed=False,
+                                               weights=list(range(len(graph.edges))))
+    in_tree = bytearray(graph.adjacency.vertex_count)
+    spanning_edge_indices = array('q')
+    # Każda składowa spójności daje osobne drzewo lasu rozpinającego
+    for root_vertex in sorted(graph.vertices):
+        if in_tree[root_vertex]:
+            continue
+        in_tree[root_vertex] = 1
+        edge_heap = [(weights[edge_indices[i]], edge_indices[i], targets[i])
+                     for i in range(offsets[root_vertex], offsets[root_vertex + 1])]
+        heapify(edge_heap)
+        while edge_heap:
+            _, edge_index, vertex = heappop(edge_heap)
+            if in_tree[vertex]:
+                continue
+            in_tree[vertex] = 1
+            spanning_edge_indices.append(edge_index)
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                if not in_tree[targets[i]]:
+                    heappush(edge_heap, (weights[edge_indices[i]], edge_indices[i], targets[i]))
+    return spanning_edge_indices
+
+
+def boruvka_edge_indices(graph: WeightedGraph) -> array:
+    # W każdej rundzie każda składowa wybiera najlżejszą krawędź wychodzącą. Remisy rozstrzyga
+    # globalny ranking (waga, numer krawędzi), więc wybrane krawędzie nie tworzą cyklu.
+    if numpy is None:
+        return _boruvka_edge_indices_python(graph)
+
+    vertex_count = graph.adjacency.vertex_count
+    edge_count = len(graph.edges)
+    edge_ends = numpy.array(list(graph.edges), dtype=numpy.int64).reshape(-1, 2)
+    tails, heads = edge_ends[:, 0], edge_ends[:, 1]
+    order = numpy.argsort(numpy.array(graph.edges.weights), kind='stable')
+    rank = numpy.empty(edge_count, dtype=numpy.int64)
+    rank[order] = numpy.arange(edge_count)
+
+    vertices_disjoint_sets = UnionFind(vertex_count)
+    labels = numpy.arange(vertex_count)
+    spanning_edge_indices = array('q')
+    active = numpy.arange(edge_count)
+    while True:
+        tail_labels, head_labels = labels[tails[active]], labels[heads[active]]
+        crossing = tail_labels != head_labels
+        active, tail_labels, head_labels = active[crossing], tail_labels[crossing], head_labels[crossing]
+        if not len(active):
+            break
+        best_rank = numpy.full(vertex_count, edge_count)
+        numpy.minimum.at(best_rank, tail_labels, rank[active])
+        numpy.minimum.at(best_rank, head_labels, rank[active])
+        for edge_index in order[numpy.unique(best_rank[best_rank < edge_count])]:
+            edge = graph.edges[edge_index]
+            if vertices_disjoint_sets.union(edge[0], edge[1]):
+                spanning_edge_indices.append(int(edge_index))
+        # Etykiety składowych: korzenie w UnionFind po przeskakiwaniu wskaźników
+        labels = numpy.array(vertices_disjoint_sets.parent)
+        while True:
+            next_labels = labels[labels]
+            if numpy.array_equal(next_labels, labels):
+                break
+            labels = next_labels
+    return spanning_edge_indices
 
-    for edge in sorted(graph.edges, key=lambda e: graph.weight_map[e]):
-        v0_disjoint_set, v1_disjoint_set = vertices_disjoint_sets[edge[0]], vertices_disjoint_sets[edge[1]]
-        if disjoint_set.find(v0_disjoint_set) != disjoint_set.find(v1_disjoint_set):
-            min_spanning_tree_edges.add(edge)
-            disjoint_set.union(v0_disjoint_set, v1_disjoint_set)
 
+def _boruvka_edge_indices_python(graph: WeightedGraph) -> array:
+    weights = graph.edges.weights
+    vertices_disjoint_sets = UnionFind(graph.adjacency.vertex_count)
+    spanning_edge_indices = array('q')
+    active = list(range(len(graph.edges)))
+    while True:
+        best_edge = {}
+        remaining = []
+        for edge_index in active:
+            u, v = graph.edges[edge_index]
+            u_root, v_root = vertices_disjoint_sets.find(u), vertices_disjoint_sets.find(v)
+            if u_root == v_root:
+                continue
+            remaining.append(edge_index)
+            key = (weights[edge_index], edge_index)
+            for root in (u_root, v_root):
+                if root not in best_edge or key < best_edge[root]:
+                    best_edge[root] = key
+        if not remaining:
+            break
+        for _, edge_index in set(best_edge.values()):
+            edge = graph.edges[edge_index]
+            if vertices_disjoint_sets.union(edge[0], edge[1]):
+                spanning_edge_indices.append(edge_index)
+        active = remaining
+    return spanning_edge_indices
+
+
+MST_ENGINES = {
+    'kruskal': kruskal_edge_indices,
+    'prim': prim_edge_indices,
+    'boruvka': boruvka_edge_indices,
+}
+
+
+def choose_mst_engine(graph: WeightedGraph) -> str:
+    vertex_count, edge_count = len(graph.vertices), len(graph.edges)
+    if vertex_count > 1 and edge_count >= PRIM_MIN_DENSITY * vertex_count * (vertex_count - 1) / 2:
+        return 'prim'
+    if numpy is not None and edge_count >= BORUVKA_MIN_EDGES:
+        return 'boruvka'
+    return 'kruskal'
+
+
+def minimum_spanning_tree(graph: WeightedGraph, engine: str = None, edges_only: bool = False):
+    # Dla edges_only=True zwracane są tylko numery krawędzi (pozycje w graph.edges) i łączna waga
+    engine = engine or choose_mst_engine(graph)
+    if engine not in MST_ENGINES:
+        raise ValueError('Nieznany algorytm minimalnego drzewa spinającego: {}.'.format(engine))
+    spanning_edge_indices = MST_ENGINES[engine](graph)
+    if edges_only:
+        return spanning_edge_indices, sum(graph.edges.weights[i] for i in spanning_edge_indices)
+
+    min_spanning_tree_edges = [graph.edges[i] for i in spanning_edge_indices]
     min_spanning_tree_vertices = set()
     for spanning_edge in min_spanning_tree_edges:
         min_spanning_tree_vertices.add(spanning_edge[0])
         min_spanning_tree_vertices.add(spanning_edge[1])
 
-    min_spanning_tree = Tree(edges=list(min_spanning_tree_edges),
+    min_spanning_tree = Tree(edges=min_spanning_tree_edges,
                              vertices=min_spanning_tree_vertices)
     return min_spanning_tree
 
 
+def kruskal(graph: WeightedGraph):
+    return minimum_spanning_tree(graph, engine='kruskal')
+
+
 if __name__ == '__main__':
     g = WeightedGraph.create_from_user_input()
     kruskal_min_spanning_tree = kruskal(g)
@@ -0,0 +1,162 @@
+from array import array
+
+from adjacency import build_csr
+from tree import Tree
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class LcaIndex:
+    # Indeks najniższych wspólnych przodków dla ukorzenionego drzewa: obchód Eulera
+    # i tablica rzadka minimów głębokości na płaskich tablicach. Budowa O(V log V),
+    # zapytanie O(1). Odległości ważone korzystają z wag krawędzi drzewa (domyślnie 1).
+    def __init__(self, tree: Tree, root: int):
+        if root not in tree.vertices:
+            raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(root))
+        self.root = root
+        vertex_count = tree.adjacency.vertex_count
+        offsets, targets, target_weights = build_csr(vertex_count, tree.edges, directed=False,
+                                                     weights=tree.edges.weights)
+        self.depth = array('q', [-1]) * vertex_count
+        self.weighted_depth = [0 for _ in range(vertex_count)]
+        self.first_visit = array('q', [-1]) * vertex_count
+        self.euler_tour = array('q')
+
+        self.depth[root] = 0
+        self.first_visit[root] = 0
+        self.euler_tour.append(root)
+        stack = [(root, offsets[root])]
+        while stack:
+            vertex, position = stack[-1]
+            while position < offsets[vertex + 1] and self.depth[targets[position]] >= 0:
+                position += 1
+            if position == offsets[vertex + 1]:
+                stack.pop()
+                if stack:
+                    self.euler_tour.append(stack[-1][0])
+                continue
+            stack[-1] = (vertex, position + 1)
+            child = targets[position]
+            self.depth[child] = self.depth[vertex] + 1
+            self.weighted_depth[child] = self.weighted_depth[vertex] + target_weights[position]
+            self.first_visit[child] = len(self.euler_tour)
+            self.euler_tour.append(child)
+            stack.append((child, offsets[child]))
+
+        # sparse_table[k][i] - wierzchołek o najmniejszej głębokości w euler_tour[i:i + 2^k]
+        if numpy is not None:
+            self.sparse_table = self._numpy_sparse_table()
+        else:
+            self.sparse_table = self._sparse_table()
+        self._numpy_tables = None
+
+    def _sparse_table(self) -> list:
+        depth = self.depth
+        sparse_table = [self.euler_tour]
+        span = 1
+        while 2 * span <= len(self.euler_tour):
+            previous_level = sparse_table[-1]
+            level = array('q', bytes(8 * (len(previous_level) - span)))
+            for i in range(len(level)):
+                left, right = previous_level[i], previous_level[i + span]
+                level[i] = left if depth[left] <= depth[right] else right
+            sparse_table.append(level)
+            span *= 2
+        return sparse_table
+
+    def _numpy_sparse_table(self) -> list:
+        # Każdy poziom to numpy.minimum przesuniętych fragmentów poprzedniego. Klucz
+        # głębokość * V + wierzchołek porządkuje według głębokości, a wierzchołek
+        # o najmniejszej głębokości w fragmencie obchodu Eulera jest jedyny.
+        vertex_count = len(self.depth)
+        tour = numpy.array(self.euler_tour, dtype=numpy.int64)
+        keys = numpy.array(self.depth, dtype=numpy.int64)[tour] * vertex_count + tour
+        sparse_table = [self.euler_tour]
+        span = 1
+        while 2 * span <= len(tour):
+            keys = numpy.minimum(keys[:-span], keys[span:])
+            sparse_table.append(array('q', (keys % vertex_count).tobytes()))
+            span *= 2
+        return sparse_table
+
+    def _check_vertex(self, vertex: int):
+        if not 0 <= vertex < len(self.first_visit) or self.first_visit[vertex] < 0:
+            raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(vertex))
+
+    def lca(self, u: int, v: int) -> int:
+        self._check_vertex(u)
+        self._check_vertex(v)
+        left, right = self.first_visit[u], self.first_visit[v]
+        if left > right:
+            left, right = right, left
+        level = (right - left + 1).bit_length() - 1
+        first = self.sparse_table[level][left]
+        second = self.sparse_table[level][right - (1 << level) + 1]
+        return first if self.depth[first] <= self.depth[second] else second
+
+    def vertex_depth(self, vertex: int) -> int:
+        self._check_vertex(vertex)
+        return self.depth[vertex]
+
+    def distance(self, u: int, v: int) -> int:
+        # Liczba krawędzi na ścieżce u - v
+        return self.depth[u] + self.depth[v] - 2 * self.depth[self.lca(u, v)]
+
+    def path_length(self, u: int, v: int):
+        # Suma wag krawędzi na ścieżce u - v
+        return self.weighted_depth[u] + self.weighted_depth[v] - 2 * self.weighted_depth[self.lca(u, v)]
+
+    def _batch_tables(self):
+        if self._numpy_tables is None:
+            table = numpy.zeros((len(self.sparse_table), len(self.euler_tour)), dtype=numpy.int64)
+            for k, level in enumerate(self.sparse_table):
+                table[k, :len(level)] = level
+            self._numpy_tables = (table, numpy.array(self.depth, dtype=numpy.int64),
+                                  numpy.array(self.weighted_depth), numpy.array(self.first_visit, dtype=numpy.int64))
+        return self._numpy_tables
+
+    def lca_batch(self, pairs):
+        # Zapytania dla tablicy par (u, v); z numpy wynik jest tablicą numpy, bez niego - listą
+        if numpy is None:
+            return [self.lca(u, v) for u, v in pairs]
+        table, depth, _, first_visit = self._batch_tables()
+        pairs = numpy.asarray(pairs, dtype=numpy.int64).reshape(-1, 2)
+        out_of_range = (pairs < 0) | (pairs >= len(first_visit))
+        invalid = out_of_range | (first_visit[numpy.where(out_of_range, 0, pairs)] < 0)
+        if invalid.any():
+            raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(int(pairs[invalid][0])))
+        left, right = first_visit[pairs[:, 0]], first_visit[pairs[:, 1]]
+        left, right = numpy.minimum(left, right), numpy.maximum(left, right)
+        level = numpy.floor(numpy.log2(right - left + 1)).astype(numpy.int64)
+        first = table[level, left]
+        second = table[level, right - (1 << level) + 1]
+        return numpy.where(depth[first] <= depth[second], first, second)
+
+    def distance_batch(self, pairs):
+        if numpy is None:
+            return [self.distance(u, v) for u, v in pairs]
+        _, depth, _, _ = self._batch_tables()
+        pairs = numpy.asarray(pairs, dtype=numpy.int64).reshape(-1, 2)
+        lowest_common_ancestors = self.lca_batch(pairs)
+        return depth[pairs[:, 0]] + depth[pairs[:, 1]] - 2 * depth[lowest_common_ancestors]
+
+    def path_length_batch(self, pairs):
+        if numpy is None:
+            return [self.path_length(u, v) for u, v in pairs]
+        _, _, weighted_depth, _ = self._batch_tables()
+        pairs = numpy.asarray(pairs, dtype=numpy.int64).reshape(-1, 2)
+        lowest_common_ancestors = self.lca_batch(pairs)
+        return weighted_depth[pairs[:, 0]] + weighted_depth[pairs[:, 1]] \
+            - 2 * weighted_depth[lowest_common_ancestors]
+
+
+if __name__ == '__main__':
+    test_tree = Tree({0, 1, 2, 3, 4, 5, 6, 7, 8},
+                     [(0, 1), (0, 2), (1, 3), (1, 4), (4, 7), (7, 6), (7, 8), (2, 5)])
+    lca_index = LcaIndex(test_tree, root=0)
+    for u, v in ((3, 6), (6, 8), (5, 8), (2, 2)):
+        print('lca({}, {}) = {}, odległość: {}'.format(u, v, lca_index.lca(u, v), lca_index.distance(u, v)))
+    print('Zapytania wsadowe: {}'.format([int(vertex) for vertex in lca_index.lca_batch([(3, 6), (6, 8), (5, 8)])]))
@@ -0,0 +1,220 @@
+from array import array
+from collections import deque
+from typing import Tuple
+
+from adjacency import build_csr
+from directed_network import DirectedNetwork
+from edmonds_karp import edmonds_karp
+
+
+class ResidualNetwork:
+    # Sieć residualna na tablicach: łuk 2i odpowiada i-tej krawędzi sieci, łuk 2i + 1 - krawędzi
+    # odwrotnej, więc łuk przeciwny do a to a ^ 1. Łuki wychodzące z v to
+    # arc_ids[offsets[v]:offsets[v + 1]], a heads[a] to koniec łuku a.
+    def __init__(self, network: DirectedNetwork):
+        self.vertex_count = network.adjacency.vertex_count
+        self.edges = list(network.edges)
+        self.heads = array('q', bytes(16 * len(self.edges)))
+        self.capacities = [0 for _ in range(2 * len(self.edges))]
+        arcs = []
+        for i, ((u, v), capacity) in enumerate(zip(self.edges, network.edges.weights)):
+            self.heads[2 * i] = v
+            self.heads[2 * i + 1] = u
+            self.capacities[2 * i] = max(capacity, 0)
+            arcs.append((u, v))
+            arcs.append((v, u))
+        self.offsets, _, self.arc_ids = build_csr(self.vertex_count, arcs, directed=True,
+                                                  weights=list(range(len(arcs))))
+
+    def levels_from(self, source: int) -> list:
+        level = [-1 for _ in range(self.vertex_count)]
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            v = queue.popleft()
+            for position in range(self.offsets[v], self.offsets[v + 1]):
+                arc = self.arc_ids[position]
+                w = self.heads[arc]
+                if self.capacities[arc] > 0 and level[w] < 0:
+                    level[w] = level[v] + 1
+                    queue.append(w)
+        return level
+
+    def flows(self) -> dict:
+        flows = {}
+        for i, edge in enumerate(self.edges):
+            flow_value = self.capacities[2 * i + 1]
+            if flow_value > 0:
+                flows[edge] = flows.get(edge, 0) + flow_value
+        return flows
+
+    def minimal_cut(self, source: int) -> list:
+        level = self.levels_from(source)
+        return [(u, v) for u, v in self.edges if level[u] >= 0 > level[v]]
+
+
+def dinic(network: DirectedNetwork):
+    residual = ResidualNetwork(network)
+    source, sink = network.start_vertex, network.end_vertex
+    heads, capacities, offsets, arc_ids = residual.heads, residual.capacities, residual.offsets, residual.arc_ids
+    max_flow = 0
+
+    while True:
+        level = residual.levels_from(source)
+        if level[sink] < 0:
+            break
+        # Przepływ blokujący w grafie warstwowym; current_arc pamięta pierwszy niesprawdzony łuk
+        current_arc = list(offsets)
+        path = []
+        vertex = source
+        while True:
+            if vertex == sink:
+                flow_to_increase = min(capacities[arc] for arc in path)
+                for arc in path:
+                    capacities[arc] -= flow_to_increase
+                    capacities[arc ^ 1] += flow_to_increase
+                max_flow += flow_to_increase
+                saturated = next(i for i, arc in enumerate(path) if capacities[arc] == 0)
+                del path[saturated:]
+                vertex = heads[path[-1]] if path else source
+                continue
+
+            while current_arc[vertex] < offsets[vertex + 1]:
+                arc = arc_ids[current_arc[vertex]]
+                if capacities[arc] > 0 and level[heads[arc]] == level[vertex] + 1:
+                    break
+                current_arc[vertex] += 1
+            else:
+                if vertex == source:
+                    break
+                level[vertex] = -1
+                vertex = heads[path.pop() ^ 1]
+                current_arc[vertex] += 1
+                continue
+
+            path.append(arc)
+            vertex = heads[arc]
+
+    return max_flow, residual.minimal_cut(source), residual.flows()
+
+
+def push_relabel(network: DirectedNetwork):
+    # Wariant z wyborem aktywnego wierzchołka o najwyższej etykiecie i heurystyką luki
+    residual = ResidualNetwork(network)
+    source, sink = network.start_vertex, network.end_vertex
+    heads, capacities, offsets, arc_ids = residual.heads, residual.capacities, residual.offsets, residual.arc_ids
+    vertex_count = residual.vertex_count
+
+    # Początkowe etykiety: odległości do ujścia w sieci residualnej
+    height = [vertex_count for _ in range(vertex_count)]
+    height[sink] = 0
+    queue = deque([sink])
+    while queue:
+        w = queue.popleft()
+        for position in range(offsets[w], offsets[w + 1]):
+            arc = arc_ids[position]
+            v = heads[arc]
+            if capacities[arc ^ 1] > 0 and height[v] == vertex_count and v != sink:
+                height[v] = height[w] + 1
+                queue.append(v)
+    height[source] = vertex_count
+
+    height_count = [0 for _ in range(2 * vertex_count + 1)]
+    for h in height:
+        height_count[h] += 1
+
+    excess = [0 for _ in range(vertex_count)]
+    buckets = [[] for _ in range(2 * vertex_count + 1)]
+    for position in range(offsets[source], offsets[source + 1]):
+        arc = arc_ids[position]
+        w = heads[arc]
+        flow_value = capacities[arc]
+        if flow_value > 0:
+            capacities[arc] = 0
+            capacities[arc ^ 1] += flow_value
+            if excess[w] == 0 and w != sink and w != source:
+                buckets[height[w]].append(w)
+            excess[w] += flow_value
+            excess[source] -= flow_value
+
+    current_arc = list(offsets)
+    highest = 2 * vertex_count
+    while highest >= 0:
+        if not buckets[highest]:
+            highest -= 1
+            continue
+        vertex = buckets[highest].pop()
+        if height[vertex] != highest:
+            # Etykieta zmieniona przez heurystykę luki
+            buckets[height[vertex]].append(vertex)
+            highest = max(highest, height[vertex])
+            continue
+
+        while excess[vertex] > 0:
+            if current_arc[vertex] == offsets[vertex + 1]:
+                old_height = height[vertex]
+                new_height = 2 * vertex_count
+                for position in range(offsets[vertex], offsets[vertex + 1]):
+                    arc = arc_ids[position]
+                    if capacities[arc] > 0 and height[heads[arc]] + 1 < new_height:
+                        new_height = height[heads[arc]] + 1
+                height_count[old_height] -= 1
+                height[vertex] = new_height
+                height_count[new_height] += 1
+                current_arc[vertex] = offsets[vertex]
+                if height_count[old_height] == 0 and old_height < vertex_count:
+                    for v in range(vertex_count):
+                        if old_height < height[v] < vertex_count:
+                            height_count[height[v]] -= 1
+                            height[v] = vertex_count + 1
+                            height_count[height[v]] += 1
+                continue
+
+            arc = arc_ids[current_arc[vertex]]
+            w = heads[arc]
+            if capacities[arc] > 0 and height[vertex] == height[w] + 1:
+                flow_value = min(excess[vertex], capacities[arc])
+                capacities[arc] -= flow_value
+                capacities[arc ^ 1] += flow_value
+                if excess[w] == 0 and w != sink and w != source:
+                    buckets[height[w]].append(w)
+                excess[vertex] -= flow_value
+                excess[w] += flow_value
+            else:
+                current_arc[vertex] += 1
+        highest = max(highest, height[vertex])
+
+    return excess[sink], residual.minimal_cut(source), residual.flows()
+
+
+MAX_FLOW_ENGINES = {
+    'edmonds_karp': edmonds_karp,
+    'dinic': dinic,
+    'push_relabel': push_relabel,
+}
+
+
+def max_flow(network: DirectedNetwork, engine: str = 'dinic') -> Tuple[int, list, dict]:
+    if engine not in MAX_FLOW_ENGINES:
+        raise ValueError('Nieznany algorytm maksymalnego przepływu: {}.'.format(engine))
+    return MAX_FLOW_ENGINES[engine](network)
+
+
+if __name__ == '__main__':
+    test_network = DirectedNetwork(edges=[(0, 1), (0, 2),
+                                          (1, 2), (1, 3),
+                                          (2, 1), (2, 4),
+                                          (3, 2), (3, 5),
+                                          (4, 3), (4, 5)],
+                                   weights=[16, 13,
+                                            10, 12,
+                                            4, 14,
+                                            9, 20,
+                                            7, 4],
+                                   vertices=set([i for i in range(0, 6)]),
+                                   start_vertex=0,
+                                   end_vertex=5)
+    for engine_name in ('dinic', 'push_relabel'):
+        max_flow_value, minimal_cut, flows = max_flow(test_network, engine=engine_name)
+        print(f'{engine_name}: maksymalny przepływ {max_flow_value}, minimalny przekrój: {minimal_cut}, '
+              f'Przepływy: {flows}')
@@ -1,9 +1,16 @@
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from typing import Set, Tuple
+from heapq import heappop, heappush
+from typing import Tuple
 
+from adjacency import build_csr
+from disjoint_set import UnionFind
 from graph import Graph
 from directed_network import DirectedNetwork
-from edmonds_karp import edmonds_karp
+from max_flow import max_flow
 
 
 class VertexColour(Enum):
@@ -17,32 +24,114 @@ class VertexColour(Enum):
             return VertexColour.RED
 
 
-def dfs_bipart_visit_vertex(graph: Graph, vertex,
-                            vertex_colours: dict,
-                            color_to_use: VertexColour):
-    if not vertex_colours[vertex]:
-        vertex_colours[vertex] = color_to_use
-    for neighbour_vertex in graph.get_vertex_neighbours(vertex):
-        if vertex_colours[neighbour_vertex] == vertex_colours[vertex]:
-            raise ValueError('Podany graf nie jest dwudzielny.')
-        if not vertex_colours[neighbour_vertex]:
-            dfs_bipart_visit_vertex(graph, neighbour_vertex, vertex_colours,
-                                    color_to_use.opposite_colour())
+class OddCycleError(ValueError):
+    def __init__(self, cycle: list):
+        super().__init__('Podany graf nie jest dwudzielny, cykl nieparzysty: {}.'.format(cycle))
+        self.cycle = cycle
 
 
-def dfs_bipart(graph: Graph) -> dict or None:
-    vertex_colours = {v: None for v in graph.vertices}
-    start_vertex = list(graph.vertices)[0]
-    dfs_bipart_visit_vertex(graph=graph, vertex=start_vertex,
-                            vertex_colours=vertex_colours, color_to_use=VertexColour.RED)
+UNCOLOURED = -1
+
+
+def _bfs_colour(vertex_count: int, edges, roots) -> Tuple[array, list or None]:
+    # Kolorowanie BFS wszystkich składowych zawierających wierzchołki z roots. Zwraca tablicę
+    # kolorów (wartości VertexColour, -1 dla pozycji bez wierzchołka) i cykl nieparzysty albo None.
+    offsets, targets = build_csr(vertex_count, edges, directed=False)
+    colours = array('b', [UNCOLOURED]) * vertex_count
+    parents = array('q', [-1]) * vertex_count
+    for root in roots:
+        if colours[root] != UNCOLOURED:
+            continue
+        colours[root] = VertexColour.RED.value
+        queue = [root]
+        for vertex in queue:
+            opposite_colour = 1 - colours[vertex]
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                neighbour_vertex = targets[i]
+                if colours[neighbour_vertex] == UNCOLOURED:
+                    colours[neighbour_vertex] = opposite_colour
+                    parents[neighbour_vertex] = vertex
+                    queue.append(neighbour_vertex)
+                elif colours[neighbour_vertex] != opposite_colour:
+                    return colours, _odd_cycle(parents, vertex, neighbour_vertex)
+    return colours, None
+
+
+def _odd_cycle(parents: array, u: int, v: int) -> list:
+    # Krawędź u - v łączy wierzchołki tego samego koloru: cykl to ścieżki drzewa BFS
+    # od u i od v do ich najniższego wspólnego przodka, domknięte tą krawędzią
+    u_ancestors = [u]
+    while parents[u_ancestors[-1]] >= 0:
+        u_ancestors.append(parents[u_ancestors[-1]])
+    u_ancestor_set = set(u_ancestors)
+    v_path = [v]
+    while v_path[-1] not in u_ancestor_set:
+        v_path.append(parents[v_path[-1]])
+    cycle = u_ancestors[:u_ancestors.index(v_path[-1]) + 1]
+    cycle.extend(reversed(v_path[:-1]))
+    return cycle
+
 
-    return vertex_colours
+def _colour_subgraph(vertices: list, edges: list) -> Tuple[list, list or None]:
+    # Zadanie dla procesu roboczego: numeracja lokalna, żeby tablice miały rozmiar podgrafu
+    local_index = {vertex: i for i, vertex in enumerate(vertices)}
+    local_edges = [(local_index[u], local_index[v]) for u, v in edges]
+    colours, cycle = _bfs_colour(len(vertices), local_edges, range(len(vertices)))
+    if cycle is not None:
+        cycle = [vertices[i] for i in cycle]
+    return list(colours), cycle
 
 
-def bipart_graph(graph: Graph) -> Tuple[set, set]:
-    vertex_colours = dfs_bipart(graph=graph)
-    red_part = {v for v, colour in vertex_colours.items() if colour == VertexColour.RED}
-    blue_part = {v for v, colour in vertex_colours.items() if colour == VertexColour.BLUE}
+def bfs_bipart(graph: Graph, parallel: bool = False, max_workers: int = None) -> array:
+    # Podział na dwie części obejmujący wszystkie składowe; kierunek krawędzi nie ma znaczenia.
+    # Dla parallel=True składowe (wyznaczone przez UnionFind) dzielone są na grupy kolorowane
+    # w osobnych procesach. Gdy graf nie jest dwudzielny, zgłaszany jest OddCycleError ze świadkiem.
+    vertex_count = graph.adjacency.vertex_count
+    if not parallel:
+        colours, cycle = _bfs_colour(vertex_count, graph.edges, sorted(graph.vertices))
+        if cycle is not None:
+            raise OddCycleError(cycle)
+        return colours
+
+    vertices_disjoint_sets = UnionFind(vertex_count)
+    vertices_disjoint_sets.union_many(graph.edges)
+    components = {}
+    for vertex in sorted(graph.vertices):
+        components.setdefault(vertices_disjoint_sets.find(vertex), []).append(vertex)
+
+    # Grupy o zbliżonej liczbie wierzchołków: kolejne największe składowe do najmniejszej grupy
+    max_workers = max_workers or os.cpu_count() or 1
+    groups = [[] for _ in range(min(max_workers, len(components)))]
+    group_index = {}
+    group_sizes = [(0, i) for i in range(len(groups))]
+    for root, component in sorted(components.items(), key=lambda item: len(item[1]), reverse=True):
+        size, i = heappop(group_sizes)
+        groups[i].extend(component)
+        group_index[root] = i
+        heappush(group_sizes, (size + len(component), i))
+    group_edges = [[] for _ in groups]
+    for edge in graph.edges:
+        group_edges[group_index[vertices_disjoint_sets.find(edge[0])]].append(edge)
+
+    colours = array('b', [UNCOLOURED]) * vertex_count
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for group, (group_colours, cycle) in zip(groups, executor.map(_colour_subgraph, groups, group_edges)):
+            if cycle is not None:
+                raise OddCycleError(cycle)
+            for vertex, colour in zip(group, group_colours):
+                colours[vertex] = colour
+    return colours
+
+
+def dfs_bipart(graph: Graph) -> dict or None:
+    vertex_colours = bfs_bipart(graph)
+    return {v: VertexColour(vertex_colours[v]) for v in graph.vertices}
+
+
+def bipart_graph(graph: Graph, parallel: bool = False) -> Tuple[set, set]:
+    vertex_colours = bfs_bipart(graph, parallel=parallel)
+    red_part = {v for v in graph.vertices if vertex_colours[v] == VertexColour.RED.value}
+    blue_part = {v for v in graph.vertices if vertex_colours[v] == VertexColour.BLUE.value}
 
     return blue_part, red_part
 
@@ -73,10 +162,103 @@ def biparted_graph_to_flow_network(graph: Graph, biparted_vertices: Tuple[set, s
     return flow_network
 
 
-def maximal_matching(graph: Graph):
+def hopcroft_karp(graph: Graph, matching: list = None) -> list:
+    # Skojarzenie zwracane jako tablica partnerów: partner[v] to wierzchołek skojarzony z v lub -1.
+    # Opcjonalna tablica matching (np. wynik poprzedniego wywołania) jest punktem startowym;
+    # pary, których krawędź nie należy już do grafu, są pomijane. Graf wejściowy nie jest modyfikowany.
+    _, red_part = bipart_graph(graph)
+    return _hopcroft_karp(graph, sorted(red_part), matching)
+
+
+def _hopcroft_karp(graph: Graph, left_vertices: list, matching: list = None) -> list:
+    neighbour_lists = {u: list(graph.adjacency.neighbours(u)) for u in left_vertices}
+
+    partner = [-1 for _ in range(graph.adjacency.vertex_count)]
+    if matching is not None:
+        for u in left_vertices:
+            if u < len(matching):
+                v = matching[u]
+                if v >= 0 and partner[v] == -1 and graph.adjacency.multiplicity(u, v) > 0:
+                    partner[u] = v
+                    partner[v] = u
+
+    unreachable = len(partner) + 1
+    distance = {}
+    while True:
+        # Warstwy BFS od wolnych wierzchołków lewej strony po ścieżkach naprzemiennych
+        queue = deque()
+        for u in left_vertices:
+            if partner[u] == -1:
+                distance[u] = 0
+                queue.append(u)
+            else:
+                distance[u] = unreachable
+        free_distance = unreachable
+        while queue:
+            u = queue.popleft()
+            if distance[u] >= free_distance:
+                continue
+            for v in neighbour_lists[u]:
+                matched_vertex = partner[v]
+                if matched_vertex == -1:
+                    free_distance = min(free_distance, distance[u] + 1)
+                elif distance[matched_vertex] == unreachable:
+                    distance[matched_vertex] = distance[u] + 1
+                    queue.append(matched_vertex)
+        if free_distance == unreachable:
+            break
+
+        # Maksymalny zbiór rozłącznych najkrótszych ścieżek powiększających (iteracyjny DFS)
+        next_neighbour = {u: 0 for u in left_vertices}
+        for root in left_vertices:
+            if partner[root] != -1:
+                continue
+            path = [root]
+            path_neighbours = []
+            while path:
+                u = path[-1]
+                neighbours = neighbour_lists[u]
+                augmented = advanced = False
+                while next_neighbour[u] < len(neighbours):
+                    v = neighbours[next_neighbour[u]]
+                    next_neighbour[u] += 1
+                    matched_vertex = partner[v]
+                    if matched_vertex == -1:
+                        if distance[u] + 1 == free_distance:
+                            path_neighbours.append(v)
+                            augmented = True
+                            break
+                    elif distance[matched_vertex] == distance[u] + 1:
+                        path_neighbours.append(v)
+                        path.append(matched_vertex)
+                        advanced = True
+                        break
+                if augmented:
+                    for left_vertex, right_vertex in zip(path, path_neighbours):
+                        partner[left_vertex] = right_vertex
+                        partner[right_vertex] = left_vertex
+                    break
+                if not advanced:
+                    distance[u] = unreachable
+                    path.pop()
+                    if path_neighbours:
+                        path_neighbours.pop()
+
+    return partner
+
+
+def maximal_matching(graph: Graph, engine: str = 'hopcroft_karp'):
+    if engine == 'hopcroft_karp':
+        _, red_part = bipart_graph(graph)
+        left_vertices = sorted(red_part)
+        partner = _hopcroft_karp(graph, left_vertices)
+        return [(u, partner[u]) for u in left_vertices if partner[u] != -1]
+
+    # Sieć przepływowa budowana jest na kopii, żeby nie modyfikować grafu wejściowego
+    graph = Graph(vertices=set(graph.vertices), edges=list(graph.edges), storage=graph.storage)
     biparted_vertices = bipart_graph(graph)
     flow_network = biparted_graph_to_flow_network(graph, biparted_vertices)
-    _, _, flows = edmonds_karp(flow_network)
+    _, _, flows = max_flow(flow_network, engine=engine)
     max_match = [e for e, flow_value in flows.items() if flow_value == 1
                  and e[0] != flow_network.start_vertex and e[1] != flow_network.end_vertex]
     return max_match
@@ -0,0 +1,282 @@
+from array import array
+from collections import deque
+from math import inf
+from typing import Tuple
+
+from adjacency import build_csr
+from graph import Graph
+
+
+class NegativeCycleError(ValueError):
+    def __init__(self, cycle: list):
+        super().__init__('Graf zawiera cykl o ujemnej wadze: {}.'.format(cycle))
+        self.cycle = cycle
+
+
+class IndexedHeap:
+    # Kopiec binarny elementów 0..n-1 z kluczami; position[x] to miejsce x w kopcu (-1 poza kopcem),
+    # dzięki czemu zmniejszenie klucza nie wymaga dokładania duplikatów
+    def __init__(self, capacity: int):
+        self.heap = array('q')
+        self.position = array('q', [-1]) * capacity
+        self.keys = [inf for _ in range(capacity)]
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item: int):
+        return self.position[item] >= 0
+
+    def min_key(self):
+        return self.keys[self.heap[0]] if self.heap else inf
+
+    def push_or_decrease(self, item: int, key) -> bool:
+        if self.position[item] < 0:
+            self.keys[item] = key
+            self.position[item] = len(self.heap)
+            self.heap.append(item)
+        elif key < self.keys[item]:
+            self.keys[item] = key
+        else:
+            return False
+        self._sift_up(self.position[item])
+        return True
+
+    def pop(self) -> Tuple[int, float]:
+        heap, position = self.heap, self.position
+        item = heap[0]
+        last_item = heap.pop()
+        position[item] = -1
+        if heap:
+            heap[0] = last_item
+            position[last_item] = 0
+            self._sift_down(0)
+        return item, self.keys[item]
+
+    def _sift_up(self, i: int):
+        heap, position, keys = self.heap, self.position, self.keys
+        item = heap[i]
+        key = keys[item]
+        while i > 0:
+            parent = (i - 1) >> 1
+            parent_item = heap[parent]
+            if keys[parent_item] <= key:
+                break
+            heap[i] = parent_item
+            position[parent_item] = i
+            i = parent
+        heap[i] = item
+        position[item] = i
+
+    def _sift_down(self, i: int):
+        heap, position, keys = self.heap, self.position, self.keys
+        size = len(heap)
+        item = heap[i]
+        key = keys[item]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            if keys[heap[child]] >= key:
+                break
+            heap[i] = heap[child]
+            position[heap[i]] = i
+            i = child
+        heap[i] = item
+        position[item] = i
+
+
+def weighted_csr(graph: Graph, reverse: bool = False):
+    # Krawędzie nieskierowane dostępne są w obu kierunkach; reverse odwraca łuki grafu skierowanego
+    edges = graph.edges
+    if reverse and graph.directed:
+        edges = [(v, u) for u, v in edges]
+    return build_csr(graph.adjacency.vertex_count, edges, directed=graph.directed, weights=graph.edges.weights)
+
+
+def _check_vertex(graph: Graph, vertex: int):
+    if vertex not in graph.vertices:
+        raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(vertex))
+
+
+def dijkstra(graph: Graph, source: int, max_distance=inf, target: int = None) -> Tuple[list, array]:
+    # Odległości od source (inf dla nieosiągniętych) i tablica poprzedników (-1 dla braku).
+    # Przeszukiwanie kończy się po ustaleniu target albo po przekroczeniu max_distance;
+    # wierzchołki dalsze niż max_distance pozostają z odległością inf.
+    _check_vertex(graph, source)
+    if any(weight < 0 for weight in graph.edges.weights):
+        raise ValueError('Algorytm Dijkstry wymaga nieujemnych wag krawędzi.')
+    offsets, targets, target_weights = weighted_csr(graph)
+    return csr_dijkstra(offsets, targets, target_weights, source, max_distance, target)
+
+
+def csr_dijkstra(offsets, targets, target_weights, source: int, max_distance=inf,
+                 target: int = None) -> Tuple[list, array]:
+    vertex_count = len(offsets) - 1
+    distances = [inf for _ in range(vertex_count)]
+    predecessors = array('q', [-1]) * vertex_count
+    settled = bytearray(vertex_count)
+
+    heap = IndexedHeap(vertex_count)
+    heap.push_or_decrease(source, 0)
+    while heap:
+        vertex, distance = heap.pop()
+        if distance > max_distance:
+            predecessors[vertex] = -1
+            break
+        distances[vertex] = distance
+        settled[vertex] = 1
+        if vertex == target:
+            break
+        for i in range(offsets[vertex], offsets[vertex + 1]):
+            neighbour_vertex = targets[i]
+            if not settled[neighbour_vertex] \
+                    and heap.push_or_decrease(neighbour_vertex, distance + target_weights[i]):
+                predecessors[neighbour_vertex] = vertex
+    for vertex in heap.heap:
+        predecessors[vertex] = -1
+    return distances, predecessors
+
+
+def bidirectional_dijkstra(graph: Graph, source: int, target: int) -> Tuple[float, list or None]:
+    # Długość najkrótszej ścieżki i ścieżka source - target (inf i None, gdy nie istnieje).
+    # Przeszukiwania z obu końców kończą się, gdy suma minimalnych kluczy obu kopców
+    # nie może już poprawić najlepszej znalezionej ścieżki.
+    _check_vertex(graph, source)
+    _check_vertex(graph, target)
+    if any(weight < 0 for weight in graph.edges.weights):
+        raise ValueError('Algorytm Dijkstry wymaga nieujemnych wag krawędzi.')
+    if source == target:
+        return 0, [source]
+    vertex_count = graph.adjacency.vertex_count
+    directions = []
+    for start, reverse in ((source, False), (target, True)):
+        heap = IndexedHeap(vertex_count)
+        heap.push_or_decrease(start, 0)
+        directions.append((weighted_csr(graph, reverse), heap, array('q', [-1]) * vertex_count,
+                           bytearray(vertex_count)))
+
+    best_distance = inf
+    meeting_vertex = -1
+    while directions[0][1] and directions[1][1]:
+        if directions[0][1].min_key() + directions[1][1].min_key() >= best_distance:
+            break
+        # Rozwijany jest kierunek o mniejszym kopcu
+        side = 0 if len(directions[0][1]) <= len(directions[1][1]) else 1
+        (offsets, targets, target_weights), heap, predecessors, settled = directions[side]
+        other_heap = directions[1 - side][1]
+        vertex, distance = heap.pop()
+        settled[vertex] = 1
+        for i in range(offsets[vertex], offsets[vertex + 1]):
+            neighbour_vertex = targets[i]
+            if settled[neighbour_vertex]:
+                continue
+            if heap.push_or_decrease(neighbour_vertex, distance + target_weights[i]):
+                predecessors[neighbour_vertex] = vertex
+        # Klucze drugiej strony są ostateczne dla wierzchołków ustalonych, a dla pozostałych
+        # są górnym ograniczeniem, więc suma zawsze odpowiada istniejącej ścieżce
+        for candidate in [vertex] + [targets[i] for i in range(offsets[vertex], offsets[vertex + 1])]:
+            if heap.keys[candidate] + other_heap.keys[candidate] < best_distance:
+                best_distance = heap.keys[candidate] + other_heap.keys[candidate]
+                meeting_vertex = candidate
+
+    if meeting_vertex < 0:
+        return inf, None
+    forward_path = reconstruct_path(directions[0][2], source, meeting_vertex)
+    backward_path = reconstruct_path(directions[1][2], target, meeting_vertex)
+    backward_path.reverse()
+    return best_distance, forward_path + backward_path[1:]
+
+
+def bellman_ford(graph: Graph, source: int) -> Tuple[list, array]:
+    # Wariant SPFA (kolejka wierzchołków, których odległość się zmieniła) dla wag ujemnych.
+    # Ścieżka z co najmniej V krawędziami oznacza cykl o ujemnej wadze; zgłaszany jest
+    # NegativeCycleError, gdy cykl pojawi się w grafie poprzedników.
+    _check_vertex(graph, source)
+    offsets, targets, target_weights = weighted_csr(graph)
+    return csr_bellman_ford(offsets, targets, target_weights, source, len(graph.vertices))
+
+
+def csr_bellman_ford(offsets, targets, target_weights, source: int, graph_vertex_count: int) -> Tuple[list, array]:
+    vertex_count = len(offsets) - 1
+    distances = [inf for _ in range(vertex_count)]
+    predecessors = array('q', [-1]) * vertex_count
+    path_edge_counts = array('q', bytes(8 * vertex_count))
+    in_queue = bytearray(vertex_count)
+
+    distances[source] = 0
+    queue = deque([source])
+    in_queue[source] = 1
+    while queue:
+        vertex = queue.popleft()
+        in_queue[vertex] = 0
+        distance = distances[vertex]
+        for i in range(offsets[vertex], offsets[vertex + 1]):
+            neighbour_vertex = targets[i]
+            if distance + target_weights[i] < distances[neighbour_vertex]:
+                distances[neighbour_vertex] = distance + target_weights[i]
+                predecessors[neighbour_vertex] = vertex
+                path_edge_counts[neighbour_vertex] = path_edge_counts[vertex] + 1
+                if path_edge_counts[neighbour_vertex] >= graph_vertex_count:
+                    cycle = _predecessor_cycle(predecessors, neighbour_vertex)
+                    if cycle is not None:
+                        raise NegativeCycleError(cycle)
+                if not in_queue[neighbour_vertex]:
+                    in_queue[neighbour_vertex] = 1
+                    queue.append(neighbour_vertex)
+    return distances, predecessors
+
+
+def _predecessor_cycle(predecessors: array, vertex: int) -> list or None:
+    seen = set()
+    while vertex >= 0 and vertex not in seen:
+        seen.add(vertex)
+        vertex = predecessors[vertex]
+    if vertex < 0:
+        return None
+    cycle = [vertex]
+    while predecessors[cycle[-1]] != vertex:
+        cycle.append(predecessors[cycle[-1]])
+    cycle.reverse()
+    return cycle
+
+
+def reconstruct_path(predecessors: array, source: int, target: int) -> list or None:
+    if target != source and predecessors[target] < 0:
+        return None
+    path = [target]
+    while path[-1] != source:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+
+SHORTEST_PATH_ENGINES = {
+    'dijkstra': dijkstra,
+    'bellman_ford': bellman_ford,
+}
+
+
+def shortest_paths(graph: Graph, source: int, engine: str = None) -> Tuple[list, array]:
+    # Bez wskazanego algorytmu: Dijkstra dla wag nieujemnych, w przeciwnym razie Bellman-Ford
+    if engine is None:
+        engine = 'dijkstra' if all(weight >= 0 for weight in graph.edges.weights) else 'bellman_ford'
+    if engine not in SHORTEST_PATH_ENGINES:
+        raise ValueError('Nieznany algorytm najkrótszych ścieżek: {}.'.format(engine))
+    return SHORTEST_PATH_ENGINES[engine](graph, source)
+
+
+if __name__ == '__main__':
+    from weighted_graph import WeightedGraph
+
+    test_graph = WeightedGraph(vertices={0, 1, 2, 3, 4, 5},
+                               edges=[(0, 1), (0, 2), (1, 2), (1, 3), (2, 4), (4, 3), (3, 5)],
+                               weights=[7, 9, 2, 15, 11, 6, 9])
+    test_distances, test_predecessors = dijkstra(test_graph, 0)
+    print('Odległości od wierzchołka 0: {}'.format(test_distances))
+    print('Najkrótsza ścieżka 0 - 5: {}'.format(reconstruct_path(test_predecessors, 0, 5)))
+    print('Dijkstra dwukierunkowa 0 - 5: {}'.format(bidirectional_dijkstra(test_graph, 0, 5)))
+    print('Wierzchołki w odległości co najwyżej 10: {}'.format(
+        [v for v, distance in enumerate(dijkstra(test_graph, 0, max_distance=10)[0]) if distance < inf]))
@@ -0,0 +1,88 @@
+from array import array
+
+from disjoint_set import UnionFind
+from external_kruskal import read_edges
+
+
+class StreamingComponents:
+    # Składowe spójności liczone w miarę napływu krawędzi. Krawędzie nie są przechowywane,
+    # w pamięci jest tylko UnionFind (O(V)). Bez podanej liczby wierzchołków zbiór rośnie
+    # do największego numeru wierzchołka, który pojawił się w strumieniu.
+    def __init__(self, vertex_count: int = None):
+        self.vertex_count = vertex_count
+        self.vertices_disjoint_sets = UnionFind(vertex_count or 0)
+        self.edge_count = 0
+        self.max_component_size = 1 if vertex_count else 0
+
+    def __len__(self):
+        return len(self.vertices_disjoint_sets)
+
+    def _check_vertex(self, vertex: int):
+        if vertex < 0 or self.vertex_count is not None and vertex >= self.vertex_count:
+            raise ValueError('Wierzcholek {} nie nalezy do grafu.'.format(vertex))
+        while len(self.vertices_disjoint_sets) <= vertex:
+            self.vertices_disjoint_sets.add_element()
+            self.max_component_size = max(self.max_component_size, 1)
+
+    def add_edge(self, u: int, v: int) -> bool:
+        # Informacja, czy krawędź połączyła dwie różne składowe
+        self._check_vertex(u)
+        self._check_vertex(v)
+        self.edge_count += 1
+        if not self.vertices_disjoint_sets.union(u, v):
+            return False
+        self.max_component_size = max(self.max_component_size, self.vertices_disjoint_sets.component_size(u))
+        return True
+
+    def add_edges(self, edges) -> int:
+        # Zwraca liczbę krawędzi, które połączyły różne składowe
+        return sum(self.add_edge(u, v) for u, v in edges)
+
+    @property
+    def component_count(self) -> int:
+        return self.vertices_disjoint_sets.component_count
+
+    def connected(self, u: int, v: int) -> bool:
+        # Wierzchołki, które jeszcze nie wystąpiły w strumieniu, są osobnymi składowymi
+        if max(u, v) >= len(self.vertices_disjoint_sets):
+            return u == v
+        return self.vertices_disjoint_sets.connected(u, v)
+
+    def component_size(self, vertex: int) -> int:
+        if vertex >= len(self.vertices_disjoint_sets):
+            return 1
+        return self.vertices_disjoint_sets.component_size(vertex)
+
+    def component_sizes(self) -> dict:
+        # Reprezentant składowej -> liczba wierzchołków
+        return self.vertices_disjoint_sets.component_sizes()
+
+    def labels(self) -> array:
+        # Numer składowej dla każdego wierzchołka, w kolejności najmniejszych wierzchołków składowych
+        return self.vertices_disjoint_sets.labels()
+
+
+def streaming_connected_components(edges, vertex_count: int = None) -> array:
+    components = StreamingComponents(vertex_count)
+    components.add_edges(edges)
+    return components.labels()
+
+
+def file_connected_components(edges_path: str, vertex_count: int = None) -> StreamingComponents:
+    # Plik czytany jest wiersz po wierszu, więc pamięć nie zależy od liczby krawędzi
+    components = StreamingComponents(vertex_count)
+    with open(edges_path) as edges_file:
+        components.add_edges(read_edges(edges_file))
+    return components
+
+
+if __name__ == '__main__':
+    test_components = StreamingComponents()
+    for test_edge in [(0, 1), (2, 3), (1, 2), (4, 5), (3, 0), (6, 6)]:
+        merged = test_components.add_edge(*test_edge)
+        print('Krawędź {}: połączyła składowe: {}, liczba składowych: {}, największa składowa: {}'.format(
+            test_edge, merged, test_components.component_count, test_components.max_component_size))
+    print('Wierzchołki 0 i 3 w jednej składowej: {}'.format(test_components.connected(0, 3)))
+    print('Wierzchołki 0 i 5 w jednej składowej: {}'.format(test_components.connected(0, 5)))
+    print('Rozmiary składowych: {}'.format(test_components.component_sizes()))
+    print('Etykiety składowych: {}'.format(test_components.labels().tolist()))
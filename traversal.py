@@ -0,0 +1,71 @@
+from enum import Enum
+
+from graph import Graph
+
+
+class TraversalEvent(Enum):
+    PRE_ORDER = 0
+    TREE_EDGE = 1
+    POST_ORDER = 2
+
+
+def dfs_traversal(graph: Graph, roots, visited: set = None, neighbours=None):
+    # Przeszukiwanie w głąb z jawnym stosem; generuje zdarzenia (zdarzenie, wierzchołek, rodzic).
+    # Zbiór visited może być współdzielony między kolejnymi wywołaniami, a neighbours
+    # pozwala przejść graf np. po poprzednikach zamiast po następnikach.
+    if visited is None:
+        visited = set()
+    if neighbours is None:
+        neighbours = graph.adjacency.neighbours
+
+    for root in roots:
+        if root in visited:
+            continue
+        visited.add(root)
+        yield TraversalEvent.PRE_ORDER, root, None
+        stack = [(root, iter(neighbours(root)))]
+        while stack:
+            vertex, vertex_neighbours = stack[-1]
+            for neighbour_vertex in vertex_neighbours:
+                if neighbour_vertex not in visited:
+                    visited.add(neighbour_vertex)
+                    yield TraversalEvent.TREE_EDGE, neighbour_vertex, vertex
+                    yield TraversalEvent.PRE_ORDER, neighbour_vertex, vertex
+                    stack.append((neighbour_vertex, iter(neighbours(neighbour_vertex))))
+                    break
+            else:
+                stack.pop()
+                yield TraversalEvent.POST_ORDER, vertex, stack[-1][0] if stack else None
+
+
+def dfs_pre_order(graph: Graph, roots, visited: set = None, neighbours=None):
+    for event, vertex, _ in dfs_traversal(graph, roots, visited, neighbours):
+        if event == TraversalEvent.PRE_ORDER:
+            yield vertex
+
+
+def dfs_post_order(graph: Graph, roots, visited: set = None, neighbours=None):
+    for event, vertex, _ in dfs_traversal(graph, roots, visited, neighbours):
+        if event == TraversalEvent.POST_ORDER:
+            yield vertex
+
+
+def dfs_tree_edges(graph: Graph, roots, visited: set = None, neighbours=None):
+    for event, vertex, parent in dfs_traversal(graph, roots, visited, neighbours):
+        if event == TraversalEvent.TREE_EDGE:
+            yield parent, vertex
+
+
+def dfs_path(graph: Graph, source: int, target: int, neighbours=None) -> list or None:
+    # Ścieżka z source do target wzdłuż drzewa przeszukiwania; przerywa przeszukiwanie po dotarciu do celu
+    parents = {source: None}
+    for event, vertex, parent in dfs_traversal(graph, [source], neighbours=neighbours):
+        if event == TraversalEvent.TREE_EDGE:
+            parents[vertex] = parent
+        if vertex == target:
+            path = [vertex]
+            while parents[path[-1]] is not None:
+                path.append(parents[path[-1]])
+            path.reverse()
+            return path
+    return None
@@ -1,12 +1,24 @@
-from collections import deque
+from array import array
+from typing import NamedTuple
 
+from adjacency import build_csr
 from graph import Graph
 
 
+class TreeMetrics(NamedTuple):
+    # Wyniki trzech przejść BFS liczone razem; eccentricities ma -1 poza drzewem
+    diameter: int
+    diameter_path: list
+    eccentricities: array
+    center: set
+
+
 class Tree(Graph):
-    def __init__(self, vertices: set, edges: list):
+    def __init__(self, vertices: set, edges: list, storage: str = None):
+        # Wyniki tree_metrics zapamiętywane do pierwszej zmiany drzewa
+        self._metrics = None
         if Tree._validate_tree(vertices, edges):
-            super().__init__(vertices=vertices, edges=edges)
+            super().__init__(vertices=vertices, edges=edges, storage=storage)
         else:
             raise ValueError('Podany graf nie jest drzewem.')
 
@@ -18,44 +30,108 @@ class Tree(Graph):
             return True
 
     def get_leaf_vertices(self) -> set:
-        return {v for v in self.vertices if self.get_vertex_degree(v) == 1}
+        degrees = self.adjacency.out_degrees
+        return {v for v in self.vertices if degrees[v] == 1}
 
     def remove_vertex(self, vertex: int):
         if vertex not in self.vertices:
             raise ValueError('Wierzchołek {} nie należy do grafu.'.format(vertex))
 
-        for edge in self.edges:
-            if vertex in edge:
-                self.edges.remove(edge)
+        for edge in list(self.edges.incident(vertex)):
+            self.remove_edge(edge)
 
         self.vertices.remove(vertex)
-
-        for i in range(len(self.n_matrix)):
-            self.n_matrix[i][vertex] = 0
-            self.n_matrix[vertex][i] = 0
+        self._metrics = None
+
+    def add_vertex(self) -> int:
+        self._metrics = None
+        return super().add_vertex()
+
+    def add_vertices(self, count: int) -> list:
+        self._metrics = None
+        return super().add_vertices(count)
+
+    def add_edge(self, edge: tuple, weight=1):
+        self._metrics = None
+        super().add_edge(edge, weight)
+
+    def remove_vertices(self, vertices) -> dict:
+        self._metrics = None
+        return super().remove_vertices(vertices)
+
+    def _remove_edge(self, edge: tuple):
+        self._metrics = None
+        return super()._remove_edge(edge)
+
+    def _bfs_distances(self, offsets, targets, source: int) -> tuple:
+        # Odległości (w krawędziach) i poprzednicy od source; -1 dla wierzchołków nieosiągniętych
+        distances = array('q', [-1]) * (len(offsets) - 1)
+        parents = array('q', [-1]) * (len(offsets) - 1)
+        distances[source] = 0
+        queue = [source]
+        for vertex in queue:
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                neighbour_vertex = targets[i]
+                if distances[neighbour_vertex] < 0:
+                    distances[neighbour_vertex] = distances[vertex] + 1
+                    parents[neighbour_vertex] = vertex
+                    queue.append(neighbour_vertex)
+        if len(queue) != len(self.vertices):
+            raise ValueError('Podany graf nie jest drzewem.')
+        return distances, parents, queue[-1]
+
+    def _diameter_passes(self) -> TreeMetrics:
+        # Dwa przejścia BFS: najdalszy wierzchołek od dowolnego jest końcem średnicy,
+        # a najdalszy od niego - drugim końcem. Trzecie przejście (od drugiego końca) daje
+        # mimośrody: odległość do dalszego z końców średnicy. Centrum to środkowy wierzchołek
+        # (lub dwa środkowe) ścieżki średnicy.
+        if not self.vertices:
+            return TreeMetrics(diameter=0, diameter_path=[], eccentricities=array('q'), center=set())
+        offsets, targets = build_csr(self.adjacency.vertex_count, self.edges, directed=False)
+        _, _, first_end = self._bfs_distances(offsets, targets, next(iter(self.vertices)))
+        first_distances, parents, second_end = self._bfs_distances(offsets, targets, first_end)
+        second_distances, _, _ = self._bfs_distances(offsets, targets, second_end)
+
+        diameter_path = [second_end]
+        while parents[diameter_path[-1]] >= 0:
+            diameter_path.append(parents[diameter_path[-1]])
+        middle = (len(diameter_path) - 1) // 2
+        return TreeMetrics(diameter=len(diameter_path) - 1,
+                           diameter_path=diameter_path,
+                           eccentricities=array('q', map(max, first_distances, second_distances)),
+                           center=set(diameter_path[middle:len(diameter_path) - middle]))
+
+    def tree_metrics(self) -> TreeMetrics:
+        # Wynik współdzielony przez kolejne wywołania - nie należy go modyfikować
+        if self._metrics is None:
+            self._metrics = self._diameter_passes()
+        return self._metrics
+
+    def diameter(self) -> int:
+        return self.tree_metrics().diameter
+
+    def diameter_path(self) -> list:
+        return list(self.tree_metrics().diameter_path)
+
+    def eccentricities(self) -> array:
+        return array('q', self.tree_metrics().eccentricities)
 
     def find_center(self) -> set:
-        temp_tree = Tree(vertices=set(self.vertices), edges=list(self.edges))
+        return set(self.tree_metrics().center)
+
 
-        leaf_queue = deque(temp_tree.get_leaf_vertices())
-        parent_queue = deque()
-        while len(temp_tree.vertices) > 2 or len(leaf_queue) > 0:
-            if len(leaf_queue) == 0:
-                leaf_queue = parent_queue
-                parent_queue = deque()
+def batch_tree_metrics(trees) -> list:
+    # Średnica, ścieżka średnicy, mimośrody i centrum każdego drzewa z jednej budowy
+    # tablic CSR i trzech przejść BFS na drzewo
+    return [tree.tree_metrics() for tree in trees]
 
-            leaf = leaf_queue.popleft()
-            neighbours = temp_tree.get_vertex_neighbours(leaf)
-            if not neighbours:
-                break
-            parent = neighbours.pop()
 
-            temp_tree.remove_vertex(leaf)
+def find_centers(trees) -> list:
+    return [set(metrics.center) for metrics in batch_tree_metrics(trees)]
 
-            if temp_tree.get_vertex_degree(parent) <= 1:
-                    parent_queue.append(parent)
 
-        return temp_tree.vertices
+def tree_diameters(trees) -> list:
+    return [metrics.diameter for metrics in batch_tree_metrics(trees)]
 
 
 def test():
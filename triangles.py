@@ -0,0 +1,162 @@
+from array import array
+from typing import Tuple
+
+from adjacency import MATRIX_STORAGE, choose_storage
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DENSE_ENGINE = 'dense'
+BITSET_ENGINE = 'bitset'
+SET_ENGINE = 'set'
+# Największa liczba wierzchołków, dla której sąsiedztwo zapisywane jest w bitach liczb całkowitych
+BITSET_MAX_VERTICES = 8192
+
+
+# Trójkąty liczone są w grafie prostym: krawędzie wielokrotne i pętle są pomijane, a w grafie
+# skierowanym kierunek krawędzi nie ma znaczenia. Każda krawędź jest skierowana od wierzchołka
+# o mniejszym stopniu do wierzchołka o większym, więc każdy wierzchołek ma co najwyżej O(sqrt(E))
+# następników, a każdy trójkąt znajdowany jest dokładnie raz - O(E^1.5).
+def _neighbour_sets(graph) -> list:
+    neighbour_sets = [set() for _ in range(graph.adjacency.vertex_count)]
+    for u, v in graph.edges:
+        if u != v:
+            neighbour_sets[u].add(v)
+            neighbour_sets[v].add(u)
+    return neighbour_sets
+
+
+def _forward_neighbours(neighbour_sets: list) -> list:
+    degrees = [len(neighbours) for neighbours in neighbour_sets]
+    return [{w for w in neighbours if (degrees[w], w) > (degrees[v], v)}
+            for v, neighbours in enumerate(neighbour_sets)]
+
+
+def choose_triangle_engine(graph) -> str:
+    vertex_count = graph.adjacency.vertex_count
+    if numpy is not None and choose_storage(vertex_count, len(graph.edges)) == MATRIX_STORAGE:
+        return DENSE_ENGINE
+    if vertex_count <= BITSET_MAX_VERTICES:
+        return BITSET_ENGINE
+    return SET_ENGINE
+
+
+def _closed_paths(neighbour_sets: list):
+    # Dla krawędzi u - v element [u, v] to liczba wspólnych sąsiadów u i v, poza krawędziami 0
+    vertex_count = len(neighbour_sets)
+    matrix = numpy.zeros((vertex_count, vertex_count))
+    for v, neighbours in enumerate(neighbour_sets):
+        matrix[v, list(neighbours)] = 1
+    return (matrix @ matrix) * matrix
+
+
+def _forward_bits(forward: list) -> list:
+    # Następnicy zapisani jako bity liczb całkowitych; przecięcie zbiorów to jedna operacja &
+    forward_bits = []
+    for neighbours in forward:
+        bits = 0
+        for w in neighbours:
+            bits |= 1 << w
+        forward_bits.append(bits)
+    return forward_bits
+
+
+def _bitset_triangles(forward: list):
+    forward_bits = _forward_bits(forward)
+    for u, neighbours in enumerate(forward):
+        u_bits = forward_bits[u]
+        if not u_bits:
+            continue
+        for v in neighbours:
+            common = u_bits & forward_bits[v]
+            while common:
+                lowest_bit = common & -common
+                yield u, v, lowest_bit.bit_length() - 1
+                common ^= lowest_bit
+
+
+def _set_triangles(forward: list):
+    for u, neighbours in enumerate(forward):
+        for v in neighbours:
+            for w in neighbours & forward[v]:
+                yield u, v, w
+
+
+def _triangles(graph, engine: str):
+    forward = _forward_neighbours(_neighbour_sets(graph))
+    if engine == BITSET_ENGINE:
+        return _bitset_triangles(forward)
+    return _set_triangles(forward)
+
+
+def _check_engine(graph, engine: str or None) -> str:
+    engine = engine or choose_triangle_engine(graph)
+    if engine not in (DENSE_ENGINE, BITSET_ENGINE, SET_ENGINE):
+        raise ValueError('Nieznany algorytm wyszukiwania trójkątów: {}.'.format(engine))
+    if engine == DENSE_ENGINE and numpy is None:
+        raise ValueError('Algorytm {} wymaga biblioteki numpy.'.format(engine))
+    return engine
+
+
+def find_triangle(graph, engine: str = None) -> Tuple[int, int, int] or None:
+    # Pierwszy znaleziony trójkąt (świadek) albo None; przeszukiwanie kończy się na pierwszym trafieniu
+    engine = _check_engine(graph, engine)
+    if engine == DENSE_ENGINE:
+        neighbour_sets = _neighbour_sets(graph)
+        u_vertices, v_vertices = numpy.nonzero(_closed_paths(neighbour_sets))
+        if not len(u_vertices):
+            return None
+        u, v = int(u_vertices[0]), int(v_vertices[0])
+        return u, v, min(neighbour_sets[u] & neighbour_sets[v])
+    return next(_triangles(graph, engine), None)
+
+
+def has_triangle(graph, engine: str = None) -> bool:
+    return find_triangle(graph, engine) is not None
+
+
+def triangle_count(graph, engine: str = None) -> int:
+    engine = _check_engine(graph, engine)
+    if engine == DENSE_ENGINE:
+        return int(round(_closed_paths(_neighbour_sets(graph)).sum())) // 6
+    forward = _forward_neighbours(_neighbour_sets(graph))
+    if engine == BITSET_ENGINE:
+        forward_bits = _forward_bits(forward)
+        return sum((forward_bits[u] & forward_bits[v]).bit_count()
+                   for u, neighbours in enumerate(forward) for v in neighbours)
+    return sum(len(neighbours & forward[v]) for neighbours in forward for v in neighbours)
+
+
+def vertex_triangle_counts(graph, engine: str = None) -> array:
+    # Liczba trójkątów zawierających każdy wierzchołek (indeksowana numerem wierzchołka)
+    engine = _check_engine(graph, engine)
+    if engine == DENSE_ENGINE:
+        closed_paths = _closed_paths(_neighbour_sets(graph))
+        return array('q', (int(round(count)) // 2 for count in closed_paths.sum(axis=1)))
+    counts = array('q', [0]) * graph.adjacency.vertex_count
+    for u, v, w in _triangles(graph, engine):
+        counts[u] += 1
+        counts[v] += 1
+        counts[w] += 1
+    return counts
+
+
+def clustering_coefficients(graph, engine: str = None) -> list:
+    # Lokalny współczynnik gronowania: trójkąty przy v / liczba par sąsiadów v (0 dla stopnia < 2)
+    counts = vertex_triangle_counts(graph, engine)
+    degrees = [len(neighbours) for neighbours in _neighbour_sets(graph)]
+    return [2 * count / (degree * (degree - 1)) if degree > 1 else 0.0
+            for count, degree in zip(counts, degrees)]
+
+
+if __name__ == '__main__':
+    from graph import Graph
+
+    test_graph = Graph({0, 1, 2, 3, 4}, [(0, 1), (0, 2), (1, 2), (1, 3), (2, 3), (3, 4)])
+    for engine_name in ((DENSE_ENGINE, ) if numpy is not None else ()) + (BITSET_ENGINE, SET_ENGINE):
+        print('{}: trójkąt {}, liczba trójkątów {}, trójkąty przy wierzchołkach {}'.format(
+            engine_name, find_triangle(test_graph, engine_name), triangle_count(test_graph, engine_name),
+            list(vertex_triangle_counts(test_graph, engine_name))))
+    print('Współczynniki gronowania: {}'.format(clustering_coefficients(test_graph)))
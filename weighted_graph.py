@@ -1,10 +1,15 @@
+from edge_store import WeightMap
 from graph import Graph
 
 
 class WeightedGraph(Graph):
-    def __init__(self, vertices: set, edges: list, weights: list):
-        self.weight_map = {e: w for e, w in zip(edges, weights)}
-        super(WeightedGraph, self).__init__(vertices=vertices, edges=edges)
+    def __init__(self, vertices: set, edges: list, weights: list, storage: str = None):
+        super(WeightedGraph, self).__init__(vertices=vertices, edges=edges, storage=storage, weights=weights)
+        self.weight_map = WeightMap(self.edges)
+
+    @property
+    def weights(self) -> list:
+        return self.edges.weights
 
     @classmethod
     def create_from_user_input(cls):
@@ -32,4 +37,3 @@ class WeightedGraph(Graph):
                 continue
         vertices = {v for v in range(vertex_count)}
         return cls(vertices=vertices, edges=edges, weights=weights)
-